@@ -152,6 +152,10 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'invenio_accounts.tasks.clean_session_table',
         'schedule': timedelta(minutes=60),
     },
+    'terms-usage': {
+        'task': 'cd2h_repo_project.modules.terms.tasks.update_term_usage',
+        'schedule': timedelta(hours=1),
+    },
 }
 
 # Database
@@ -268,9 +272,13 @@ RECORDS_REST_ENDPOINTS = {
                 'json_v1_response'
             )
         },
+        # Hits are projected from their source rather than dumped through
+        # RecordSchemaV1 (see cd2h_repo_project.modules.records.serializers
+        # .projections). Use json_v1_search to go back to marshmallow dumps.
         'search_serializers': {
             'application/json': (
-                'cd2h_repo_project.modules.records.serializers:json_v1_search'
+                'cd2h_repo_project.modules.records.serializers:'
+                'json_v1_projected_search'
             )
         },
         'record_loaders': {
@@ -294,6 +302,26 @@ RECORDS_REST_ENDPOINTS = {
 }
 """REST API for Records."""
 
+RECORDS_BUCKET_CACHE_TIMEOUT = 24 * 60 * 60
+"""Seconds the record of a bucket is cached for file permission checks
+   (see cd2h_repo_project.modules.records.buckets).
+"""
+
+RECORDS_JSON_ENCODER = 'json'
+"""Encoder of the JSON records and search results: 'json' (flask.json) or
+   'orjson'. orjson needs Python 3.7+ and is not a dependency: flask.json is
+   used if it is not installed
+   (see cd2h_repo_project.modules.records.serializers.encoders).
+"""
+
+RECORDS_EXPORT_CHUNK_SIZE = 500
+"""Number of records fetched from Elasticsearch at a time by exports
+   (see cd2h_repo_project.modules.records.export).
+"""
+
+RECORDS_EXPORT_SCROLL = '5m'
+"""How long Elasticsearch keeps an export's scroll between two chunks."""
+
 RECORDS_REST_FACETS = {
     # This is the name of the index/alias in ElasticSearch and not the pid type
     'records': {
@@ -642,6 +670,48 @@ SEARCH_UI_JSTEMPLATE_COUNT = 'templates/search/count.html'
 SEARCH_UI_JSTEMPLATE_SELECT_BOX = 'templates/search/sort_by.html'
 SEARCH_UI_JSTEMPLATE_RESULTS = 'templates/search/results.html'
 SEARCH_UI_JSTEMPLATE_FACETS = 'templates/search/facets.html'
+SEARCH_SINGLE_FLIGHT_ENABLED = False
+"""Identical concurrent record searches and term suggestions wait for the
+   first one's result instead of querying Elasticsearch again.
+"""
+SEARCH_SINGLE_FLIGHT_REDIS_URL = None
+"""Redis to coalesce searches across processes, e.g.
+   'redis://localhost:6379/5'. Per process only if None.
+"""
+SEARCH_SINGLE_FLIGHT_TIMEOUT = 10
+"""Seconds a search waits for an identical search in flight."""
+
+# Terms
+# =====
+TERMS_SUGGEST_BACKEND = 'elasticsearch'
+"""Engine of term suggestions: 'elasticsearch' (completion suggester) or
+   'prefix_index' (local index built by `menrva terms prefix-index`).
+"""
+TERMS_PREFIX_INDEX_PATH = None
+"""Path of the local prefix index. <instance path>/terms.prefix_index if None.
+"""
+TERMS_SUGGEST_CACHE_ENABLED = True
+"""Cache term suggestions (see cd2h_repo_project.modules.terms.cache)."""
+TERMS_SUGGEST_CACHE_SIZE = 4096
+"""Maximum number of cached suggestion responses per process."""
+TERMS_SUGGEST_CACHE_TTL = 300
+"""Seconds a cached suggestion response is served for."""
+TERMS_USAGE_MAX_TERMS = 10000
+"""Maximum number of terms per source weighted by their usage."""
+TERMS_SUGGEST_MAX_AGE = 300
+"""Seconds browsers may reuse a suggestion response without revalidating."""
+TERMS_VOCABULARY_VERSION_INTERVAL = 10
+"""Seconds between checks of the version of the indexed vocabulary."""
+TERMS_SUGGEST_CACHE_REDIS_URL = None
+"""Redis shared by all processes, e.g. 'redis://localhost:6379/4'.
+   In-process cache only if None.
+"""
+TERMS_ASGI_PREFIX = '/api/terms'
+"""Path of the terms API in the asynchronous suggestion service
+   (see cd2h_repo_project.modules.terms.asgi).
+"""
+TERMS_ASGI_ES_MAXSIZE = 25
+"""Maximum number of connections of the suggestion service to Elasticsearch."""
 
 # Contact Us
 # ==========
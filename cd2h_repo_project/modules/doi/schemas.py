@@ -1,17 +1,17 @@
 """JSON Schemas."""
-import csv
 from collections import defaultdict
 from datetime import date
-from os.path import dirname, join, realpath
 
 from flask import current_app
 from marshmallow import Schema, fields
 
-from cd2h_repo_project.modules.records.resource_type import ResourceType
+from cd2h_repo_project.modules.records.resource_type import (
+    ResourceType, resource_type_registry
+)
 
 
 class DataCiteResourceTypeMap(object):
-    """DataCite Resource Type Mapping.
+    """DataCite Resource Type Mapping (see `ResourceTypeRegistry`).
 
     TODO: If we extract this module out, make this class a configuration
           setting.
@@ -19,17 +19,7 @@ class DataCiteResourceTypeMap(object):
 
     def __init__(self):
         """Constructor."""
-        self.filename = join(
-            dirname(dirname(realpath(__file__))),
-            'records', 'data', 'resource_type_mapping.csv'
-        )
-        with open(self.filename) as f:
-            reader = csv.DictReader(f)
-            self.map = {
-                (row['Group'].lower(), row['Name'].lower()):
-                row['DataCite'].strip()
-                for row in reader
-            }
+        self.map = resource_type_registry().datacite
 
     def get(self, key, default=None):
         """Return the mapped value.
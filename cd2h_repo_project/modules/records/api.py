@@ -18,6 +18,7 @@ from invenio_records_files.api import Record as _Record
 from invenio_records_files.models import RecordsBuckets
 from werkzeug.local import LocalProxy
 
+from .buckets import cache_bucket_record_on_commit, cache_record_buckets
 from .minters import mint_pids_for_deposit
 from .signals import menrva_record_published
 
@@ -186,6 +187,7 @@ class Deposit(_Deposit):
         data['type'] = RecordType.draft.value
         deposit = super(Deposit, cls).create(data, id_=id_)
         RecordsBuckets.create(record=deposit.model, bucket=bucket)
+        cache_bucket_record_on_commit(bucket.id, deposit)
         return deposit
 
     @preserve(fields=('_deposit', '$schema', 'type'))
@@ -260,6 +262,10 @@ class Deposit(_Deposit):
                 'Could not index {0}.'.format(published_record)
             )
 
+        # After the commit, which dropped the now stale cached records
+        cache_record_buckets(self)
+        cache_record_buckets(published_record)
+
         # We DONT rely on invenio-deposit's signal because we want
         # this method to be enough to publish a Record and perform all
         # associated work
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cache of the record of each bucket.
+
+File API calls only identify a bucket. Finding its record is a join and a
+load of the record metadata, while permission checks only need a few fields
+of it. These fields are cached by bucket id:
+
+- when a deposit is created (once the transaction is committed) and when
+  it is published (`Deposit`);
+- on a miss (`get_bucket_record`).
+
+When a record is updated (e.g. its permissions change), the entries of its
+buckets are dropped once the transaction is committed, so that a concurrent
+miss can't cache the record as it was before the update.
+"""
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_records_files.models import RecordsBuckets
+
+KEY = 'menrva:bucket-record:{}'
+
+STALE_BUCKETS = 'menrva_stale_buckets'
+"""Key of the bucket ids to drop on commit, in the session info."""
+
+FRESH_BUCKETS = 'menrva_fresh_buckets'
+"""Key of the bucket id -> record summary to cache on commit, in the session
+   info.
+"""
+
+
+def record_summary(record):
+    """Return the fields of `record` needed by the permission checks.
+
+    See `permissions.ViewPermission` and `permissions.EditMetadataPermission`.
+    """
+    return _summary(record, record.id, record.revision_id)
+
+
+def _summary(data, id_, revision_id):
+    deposit = data.get('_deposit', {})
+    return {
+        'id': str(id_),
+        'revision_id': revision_id,
+        'type': data.get('type'),
+        'permissions': data.get('permissions'),
+        '_deposit': {
+            'owners': deposit.get('owners', []),
+            'pid': deposit.get('pid', {}),
+        },
+    }
+
+
+def _set(bucket_id, summary):
+    current_cache.set(
+        KEY.format(bucket_id), summary,
+        timeout=current_app.config['RECORDS_BUCKET_CACHE_TIMEOUT']
+    )
+
+
+def cache_bucket_record_on_commit(bucket_id, record):
+    """Cache `record` as the record of `bucket_id` on commit.
+
+    For a bucket created in the current transaction: nothing is cached if
+    it is rolled back.
+    """
+    db.session.info.setdefault(FRESH_BUCKETS, {})[str(bucket_id)] = \
+        record_summary(record)
+
+
+def _bucket_ids(record):
+    """Return list of ids of the buckets of `record`."""
+    return [
+        str(rb.bucket_id)
+        for rb in RecordsBuckets.query.filter_by(record_id=record.id)
+    ]
+
+
+def cache_record_buckets(record):
+    """Cache `record` as the record of all its buckets."""
+    summary = record_summary(record)
+    for bucket_id in _bucket_ids(record):
+        _set(bucket_id, summary)
+
+
+def get_bucket_record(bucket_id):
+    """Return summary of the record of `bucket_id` or None.
+
+    See `record_summary`.
+    """
+    key = KEY.format(bucket_id)
+    summary = current_cache.get(key)
+    if summary is not None:
+        return summary
+
+    # WARNING: invenio-records-files implies a one-to-one relationship
+    #          between Record and Bucket, but does not enforce it
+    #          "for better future" the invenio-records-files code says
+    record_bucket = \
+        RecordsBuckets.query.filter_by(bucket_id=bucket_id).one_or_none()
+    if not record_bucket:
+        return None
+
+    record_metadata = record_bucket.record
+    summary = _summary(
+        record_metadata.json or {}, record_metadata.id,
+        record_metadata.version_id - 1
+    )
+    _set(bucket_id, summary)
+    return summary
+
+
+def mark_stale(sender, record=None, **kwargs):
+    """Drop the cached record of the buckets of `record` on commit.
+
+    Receiver of the `invenio_records` update and delete signals.
+    """
+    bucket_ids = _bucket_ids(record)
+    db.session.info.setdefault(STALE_BUCKETS, set()).update(bucket_ids)
+    fresh = db.session.info.get(FRESH_BUCKETS, {})
+    for bucket_id in bucket_ids:
+        fresh.pop(bucket_id, None)
+
+
+def drop_stale(session):
+    """Drop the cached record of buckets marked stale in `session`.
+
+    Listener of the `after_commit` event of the database session.
+    """
+    bucket_ids = session.info.pop(STALE_BUCKETS, None)
+    if bucket_ids:
+        current_cache.delete_many(*[KEY.format(b) for b in bucket_ids])
+
+
+def cache_fresh(session):
+    """Cache the records of the buckets created in `session`.
+
+    Listener of the `after_commit` event of the database session.
+    """
+    summaries = session.info.pop(FRESH_BUCKETS, None)
+    for bucket_id, summary in (summaries or {}).items():
+        _set(bucket_id, summary)
+
+
+def forget_fresh(session, previous_transaction):
+    """Forget the records of the buckets created in `session`.
+
+    Listener of the `after_soft_rollback` event of the database session.
+    """
+    session.info.pop(FRESH_BUCKETS, None)
@@ -8,6 +8,8 @@ from flask.cli import with_appcontext
 from invenio_db import db
 from invenio_files_rest.models import Location
 
+from cd2h_repo_project.modules.records.export import FORMATS, export_records
+
 
 def load_locations(force=False):
     """
@@ -72,3 +74,34 @@ def load_locations_cli():
         'Created location(s): {0}'.format([loc.uri for loc in locations]),
         fg='green'
     )
+
+
+@click.group()
+def export():
+    """Export commands.
+
+    Usage on the command line becomes:
+
+        menrva export <command>
+
+    """
+    pass
+
+
+@export.command('records')
+@click.option(
+    '--format', '-f', 'format_name', type=click.Choice(sorted(FORMATS)),
+    default='jsonl', show_default=True
+)
+@click.option('--output', '-o', type=click.File('w'), default='-')
+@with_appcontext
+def export_records_cli(format_name, output):
+    """
+    Exports all publicly visible records.
+
+    Records are exported as an anonymous user would see them
+    (see records_filter), in one pass whatever their number.
+    """
+    with current_app.test_request_context():
+        for chunk in export_records(format_name):
+            output.write(chunk)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Bulk export of records.
+
+All records visible to the current user (see `search.records_filter`) are
+streamed as JSON Lines, CSV or CSL-JSON. Records are read with an
+Elasticsearch scroll, so an export is neither capped by max_result_window
+nor holds more than a chunk of records in memory, and is written out as it
+goes (chunked HTTP response or file).
+
+    GET /api/export/records?format=jsonl|csv|csl
+
+or
+
+    menrva export records --format jsonl|csv|csl --output <file>
+"""
+
+import csv
+import io
+from collections import namedtuple
+
+from elasticsearch.helpers import scan
+from flask import (
+    Blueprint, Response, abort, current_app, request, stream_with_context
+)
+from invenio_pidstore import current_pidstore
+from invenio_search import current_search_client
+
+from cd2h_repo_project.modules.records.links import record_links_api_factory
+from cd2h_repo_project.modules.records.search import RecordsSearch
+from cd2h_repo_project.modules.records.serializers import csl_v1
+from cd2h_repo_project.modules.records.serializers.encoders import json_dumps
+from cd2h_repo_project.modules.records.serializers.projections import (
+    record_hit_v1
+)
+
+COMPACT = dict(indent=None, separators=(',', ':'))
+
+BUFFER_SIZE = 100
+"""Number of serialized records written at once."""
+
+
+def export_hits():
+    """Generate (pid, hit) of the records visible to the current user.
+
+    The permission filter is evaluated when the first hit is requested, in
+    the current request context. Hits are fetched chunk by chunk.
+    """
+    search = RecordsSearch()
+    fetcher = current_pidstore.fetchers['recid']
+    hits = scan(
+        current_search_client,
+        query=search.to_dict(),
+        index=search._index,
+        size=current_app.config['RECORDS_EXPORT_CHUNK_SIZE'],
+        scroll=current_app.config['RECORDS_EXPORT_SCROLL'],
+    )
+    for hit in hits:
+        yield fetcher(hit['_id'], hit['_source']), hit
+
+
+def to_jsonl(pid, hit):
+    """Return record `hit` as a line of JSON, as in records API search hits.
+
+    Links are built from the configuration to be available from any app.
+    """
+    return json_dumps(
+        record_hit_v1(pid, hit, links_factory=record_links_api_factory),
+        **COMPACT
+    ) + '\n'
+
+
+CSV_COLUMNS = [
+    'id', 'title', 'authors', 'description', 'resource_type', 'license',
+    'terms', 'permissions', 'created', 'updated', 'link'
+]
+
+
+def _joined(values):
+    return '; '.join(v for v in values if v)
+
+
+def to_csv_row(values):
+    """Return CSV line of `values`."""
+    line = io.StringIO()
+    csv.writer(line).writerow(values)
+    return line.getvalue()
+
+
+def to_csv(pid, hit):
+    """Return record `hit` as a CSV line (see CSV_COLUMNS)."""
+    record = record_hit_v1(pid, hit, links_factory=record_links_api_factory)
+    metadata = record['metadata']
+    resource_type = metadata.get('resource_type') or {}
+    return to_csv_row([
+        record.get('id'),
+        metadata.get('title'),
+        _joined(a.get('full_name') for a in metadata.get('authors') or []),
+        metadata.get('description'),
+        _joined(resource_type.get('full_hierarchy') or []),
+        metadata.get('license'),
+        _joined(t.get('value') for t in metadata.get('terms') or []),
+        metadata.get('permissions'),
+        record['created'],
+        record['updated'],
+        record['links']['self'],
+    ])
+
+
+def to_csl(pid, hit):
+    """Return record `hit` as a CSL-JSON item."""
+    return json_dumps(csl_v1.transform_search_hit(pid, hit), **COMPACT)
+
+
+ExportFormat = namedtuple(
+    'ExportFormat',
+    ['mimetype', 'extension', 'start', 'serialize', 'separator', 'end']
+)
+FORMATS = {
+    'jsonl': ExportFormat(
+        mimetype='application/x-ndjson', extension='jsonl', start='',
+        serialize=to_jsonl, separator='', end=''
+    ),
+    'csv': ExportFormat(
+        mimetype='text/csv', extension='csv', start=to_csv_row(CSV_COLUMNS),
+        serialize=to_csv, separator='', end=''
+    ),
+    'csl': ExportFormat(
+        mimetype='application/vnd.citationstyles.csl+json',
+        extension='json', start='[', serialize=to_csl, separator=',\n',
+        end=']\n'
+    ),
+}
+"""Export formats by name."""
+
+
+def export_records(format_name, hits=None):
+    """Generate the export of records in `format_name` by chunks of text.
+
+    :param format_name: Key of FORMATS.
+    :param hits: Iterable of (pid, hit). `export_hits()` if None.
+    """
+    export_format = FORMATS[format_name]
+    hits = export_hits() if hits is None else hits
+
+    chunk = [export_format.start]
+    separator = ''
+    for pid, hit in hits:
+        chunk.append(separator)
+        chunk.append(export_format.serialize(pid, hit))
+        separator = export_format.separator
+        if len(chunk) >= 2 * BUFFER_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    chunk.append(export_format.end)
+    yield ''.join(chunk)
+
+
+blueprint = Blueprint(
+    'menrva_export',
+    __name__,
+    url_prefix='/export',
+)
+
+
+@blueprint.route('/records', methods=['GET'])
+def records():
+    """Stream all records visible to the current user."""
+    format_name = request.args.get('format', 'jsonl')
+    if format_name not in FORMATS:
+        abort(400)
+
+    export_format = FORMATS[format_name]
+    return Response(
+        # The request context is kept for the permission filter
+        stream_with_context(export_records(format_name)),
+        mimetype=export_format.mimetype,
+        headers={
+            'Content-Disposition': 'attachment; filename=records.{}'.format(
+                export_format.extension
+            )
+        }
+    )
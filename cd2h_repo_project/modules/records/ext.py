@@ -9,8 +9,14 @@
 
 from __future__ import absolute_import, print_function
 
+from invenio_db import db
 from invenio_indexer.signals import before_record_index
+from invenio_records.signals import after_record_delete, after_record_update
+from sqlalchemy import event
 
+from cd2h_repo_project.utils import SingleFlight
+
+from .buckets import cache_fresh, drop_stale, forget_fresh, mark_stale
 from .index_hooks import before_deposit_index_hook
 
 
@@ -28,3 +34,19 @@ class Records(object):
         before_record_index.connect(
             before_deposit_index_hook, sender=app, weak=False
         )
+        for signal in [after_record_update, after_record_delete]:
+            signal.connect(mark_stale, sender=app, weak=False)
+        listeners = [
+            ('after_commit', drop_stale),
+            ('after_commit', cache_fresh),
+            ('after_soft_rollback', forget_fresh),
+        ]
+        for name, listener in listeners:
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
+        self.search_flight = None
+        if app.config.get('SEARCH_SINGLE_FLIGHT_ENABLED'):
+            self.search_flight = SingleFlight(
+                redis_url=app.config.get('SEARCH_SINGLE_FLIGHT_REDIS_URL'),
+                timeout=app.config['SEARCH_SINGLE_FLIGHT_TIMEOUT'],
+            )
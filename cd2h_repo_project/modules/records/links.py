@@ -51,6 +51,35 @@ def url_for_record_ui_recid_external(pid_value):
     )
 
 
+def url_for_record_api_recid_external(pid_value):
+    """Return the invenio_records_rest.recid_item endpoint from any app.
+
+    Same as `url_for_record_ui_recid_external` but for the API item
+    endpoint, which the ui app can't build (e.g. from the command line).
+    Note: No request context needed.
+    """
+    return '{scheme}://{host}/api/records/{pid_value}'.format(
+        scheme=current_app.config['PREFERRED_URL_SCHEME'],
+        host=current_app.config['SERVER_HOSTNAME'],
+        pid_value=pid_value,
+    )
+
+
+def record_links_api_factory(pid, **kwargs):
+    """Return the links of a published record from any app.
+
+    WARNING: **kwargs is necessary because Invenio does a backward
+             compatibility check solely based on presence of **kwargs
+             (invenio_records_rest/_compat.py).
+
+    :param pid: recid PersistentIdentifier (or fetched PID) of the record.
+    """
+    return {
+        'self': url_for_record_api_recid_external(pid.pid_value),
+        'html': url_for_record_ui_recid_external(pid.pid_value),
+    }
+
+
 def deposit_links_api_factory(pid, **kwargs):
     """
     Return, from the API application, the useful URLs related to this record.
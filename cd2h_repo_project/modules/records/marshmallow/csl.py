@@ -8,10 +8,8 @@
 
 """Citation Style Language (CSL) Schemas."""
 
-import csv
 import re
 from datetime import date
-from os.path import dirname, join, realpath
 
 from flask import current_app
 from invenio_formatter.filters.datetime import from_isodate
@@ -21,31 +19,17 @@ from marshmallow import (
     validates_schema
 )
 
-from cd2h_repo_project.modules.records.resource_type import ResourceType
+from cd2h_repo_project.modules.records.resource_type import (
+    ResourceType, resource_type_registry
+)
 
 
 class CSLResourceTypeMap(object):
-    """CSL Resource Type Mapping.
-
-    TODO: If we reuse this Mapping pattern again, abstract away.
-    """
+    """CSL Resource Type Mapping (see `ResourceTypeRegistry`)."""
 
     def __init__(self):
         """Constructor."""
-        self.filename = join(
-            dirname(dirname(realpath(__file__))),
-            'data', 'resource_type_mapping.csv'
-        )
-        with open(self.filename) as f:
-            reader = csv.DictReader(f)
-            self.map = {
-                (
-                    row['Group'].lower(),
-                    row['Name'].lower()
-                ):
-                row['CSL'].strip()
-                for row in reader
-            }
+        self.map = resource_type_registry().csl
 
     def get(self, key, default=None):
         """Return the mapped value.
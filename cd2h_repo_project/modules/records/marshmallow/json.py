@@ -24,7 +24,7 @@ processors are invoked after the “non-raw” processors.
 
 from collections import OrderedDict, namedtuple
 
-from flask import current_app
+from flask import current_app, has_app_context
 from invenio_jsonschemas import current_jsonschemas
 from invenio_records_rest.schemas import StrictKeysMixin
 from invenio_records_rest.schemas.fields import DateString, SanitizedUnicode
@@ -40,6 +40,7 @@ from cd2h_repo_project.modules.records.resource_type import (
     ResourceType, ResourceTypeHierarchy
 )
 from cd2h_repo_project.modules.records.utilities import to_full_name
+from cd2h_repo_project.modules.terms.resolver import resolve_term_ids
 
 License = namedtuple('License', ['name', 'value'])
 # WARNING: Any change to this list should be reflected in:
@@ -94,6 +95,9 @@ class TermSchemaV1(Schema):
     value = fields.Str()
     id = fields.Str()
 
+    PLACEHOLDER_ID = 'FILL ME'
+    """Id sent by the frontend for terms without a known id."""
+
     def remove_data_envelope(self, raw_terms):
         """Returns the array of term without the optional 'data' layer.
 
@@ -109,12 +113,39 @@ class TermSchemaV1(Schema):
         """Filters out the remaining empty terms."""
         return [t for t in no_envelope_terms if t]
 
+    def attach_ids(self, loaded_terms):
+        """Sets the vocabulary id of loaded terms.
+
+        All terms are resolved in one lookup. Ids of indexed terms replace
+        the given ones. Ids of other terms are kept, placeholders aside.
+        Outside of an application (e.g. offline use of the schema), terms
+        are left as is.
+        """
+        if not has_app_context():
+            return loaded_terms
+
+        ids = resolve_term_ids(loaded_terms)
+        for term in loaded_terms:
+            term_id = ids.get((term.get('source'), term.get('value')))
+            if term_id:
+                term['id'] = term_id
+            elif term.get('id') == self.PLACEHOLDER_ID:
+                del term['id']
+        return loaded_terms
+
     def remove_duplicate_terms(self, loaded_terms):
-        """Removes duplicate term entries from loaded terms."""
-        unique_terms_dict = OrderedDict(
-            # TODO: change 'value' for 'id' when we start filling id
-            (t['value'], t) for t in loaded_terms if 'value' in t
-        )
+        """Removes duplicate term entries from loaded terms.
+
+        Terms are the same if they have the same source and value. A term
+        with an id is kept over the same term without one.
+        """
+        unique_terms_dict = OrderedDict()
+        for term in loaded_terms:
+            if 'value' not in term:
+                continue
+            key = (term.get('source'), term['value'])
+            if 'id' in term or 'id' not in unique_terms_dict.get(key, {}):
+                unique_terms_dict[key] = term
         # WHY: list is needed because otherwise a view is returned
         return list(unique_terms_dict.values())
 
@@ -138,8 +169,9 @@ class TermSchemaV1(Schema):
 
     @post_load(pass_many=True)
     def postprocess_terms(self, data, many):
-        """Remove duplicates from array of terms (data) once loaded."""
+        """Attach ids and remove duplicates from array of terms (data)."""
         if many:
+            data = self.attach_ids(data)
             data = self.remove_duplicate_terms(data)
             return data
         else:
@@ -235,6 +267,8 @@ class RecordSchemaV1(StrictKeysMixin):
 
     Note: When it comes to dumping, any data from the dumper that is not
           accounted for by this, will not be present in the dump.
+    WARNING: Any change to the dumped fields should be reflected in
+             serializers/projections.py (used for search hits).
     """
 
     id = fields.Function(serialize=get_id, deserialize=get_id, dump_only=True)
@@ -7,12 +7,13 @@ from invenio_access import Permission
 from invenio_deposit.scopes import write_scope
 from invenio_deposit.utils import check_oauth2_scope
 from invenio_files_rest.models import Bucket, MultipartObject, ObjectVersion
-from invenio_records_files.models import RecordsBuckets
+from werkzeug.local import LocalProxy
 
 from cd2h_repo_project.modules.records.api import (
     FileObject, Record, RecordType
 )
-from cd2h_repo_project.utils import get_identity
+from cd2h_repo_project.modules.records.buckets import get_bucket_record
+from cd2h_repo_project.utils import is_allowed
 
 # Need instances #
 # These are granular badge-like permissions that can be assigned via the cli
@@ -99,9 +100,7 @@ class ViewPermission(object):
             is_open_access(self.published_record) or
             has_restricted_access(self.user, self.published_record) or
             is_owner(self.user, self.published_record) or
-            Permission(menrva_view_published_record).allows(
-                get_identity(self.user)
-            )
+            is_allowed(menrva_view_published_record, self.user)
             # NOTE: by default any Permission has a super-user Need
         )
 
@@ -136,14 +135,13 @@ class EditMetadataPermission(object):
 
     def can(self):
         """Return boolean if permission valid."""
-        identity = get_identity(self.user)
         return (
             is_owner(self.user, self.record) or
             (
-                Permission(menrva_edit_published_record).allows(identity) and
+                is_allowed(menrva_edit_published_record, self.user) and
                 has_published(self.record)
             ) or
-            Permission(menrva_edit).allows(identity)
+            is_allowed(menrva_edit, self.user)
             # NOTE: by default any Permission has a super-user Need
         )
 
@@ -287,20 +285,17 @@ class FilesPermission(object):
             # Don't think this conditional should be hit
             return Permission(ActionNeed('superuser-access'))
 
-        # WARNING: invenio-records-files implies a one-to-one relationship
-        #          between Record and Bucket, but does not enforce it
-        #          "for better future" the invenio-records-files code says
-        record_bucket = \
-            RecordsBuckets.query.filter_by(bucket_id=bucket_id).one_or_none()
-        if not record_bucket:
+        # Only the fields needed to check permissions, cached by bucket
+        record = get_bucket_record(bucket_id)
+        if not record:
             return Permission(ActionNeed('superuser-access'))
 
-        record_metadata = record_bucket.record
-        record = Record(record_metadata.json, model=record_metadata)
-
-        # "Cache" the file's record in the request context
-        if record and request:
-            setattr(request, 'current_file_record', record)
+        # "Cache" the file's record in the request context, loaded on use
+        if request:
+            setattr(
+                request, 'current_file_record',
+                LocalProxy(_record_loader(record['id']))
+            )
 
         if record:
             # TODO: Differentiate between actions
@@ -313,6 +308,18 @@ class FilesPermission(object):
         return Permission(ActionNeed('superuser-access'))
 
 
+def _record_loader(record_id):
+    """Return function returning the Record of `record_id`, loaded once."""
+    records = []
+
+    def load():
+        if not records:
+            records.append(Record.get_record(record_id))
+        return records[0]
+
+    return load
+
+
 def files_permission_factory(obj, action=None):
     """Factory function for `FilesPermission.create` (equivalent).
 
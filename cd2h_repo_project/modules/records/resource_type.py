@@ -9,7 +9,9 @@
 """Resource Type Object."""
 
 import csv
+from functools import lru_cache
 from os.path import dirname, join, realpath
+from types import MappingProxyType
 
 
 class ResourceType(object):
@@ -159,7 +161,7 @@ class ResourceType(object):
     @classmethod
     def get(cls, general, specific):
         """Returns a ResourceType."""
-        if specific in cls.RESOURCE_TYPES.get(general, []):
+        if resource_type_registry().is_valid(general, specific):
             return cls(general, specific)
 
     def map(self, mapping):
@@ -167,27 +169,67 @@ class ResourceType(object):
         return mapping.get((self.general, self.specific))
 
 
+class ResourceTypeRegistry(object):
+    """Controlled vocabulary of resource types and its mappings.
+
+    Valid resource types come from `ResourceType.RESOURCE_TYPES`, the
+    hierarchy, CSL and DataCite mappings from resource_type_mapping.csv.
+    Mappings are keyed by (<general resource type>, <specific resource type>)
+    and read-only.
+
+    Use `resource_type_registry()`, which loads it once per process.
+    """
+
+    FILENAME = join(
+        dirname(realpath(__file__)), 'data', 'resource_type_mapping.csv'
+    )
+
+    def __init__(self, filename=FILENAME):
+        """Constructor."""
+        hierarchy = {}
+        csl = {}
+        datacite = {}
+        with open(filename) as f:
+            for row in csv.DictReader(f):
+                key = (row['Group'].lower(), row['Name'].lower())
+                hierarchy[key] = tuple(
+                    [e.strip().lower() for e in row['Hierarchy'].split(",")] +
+                    [row['Name'].lower()]
+                )
+                csl[key] = row['CSL'].strip()
+                datacite[key] = row['DataCite'].strip()
+
+        self.hierarchy = MappingProxyType(hierarchy)
+        self.csl = MappingProxyType(csl)
+        self.datacite = MappingProxyType(datacite)
+        self.valid = frozenset(
+            (general, specific)
+            for general, specifics in ResourceType.RESOURCE_TYPES.items()
+            for specific in specifics
+        )
+
+    def is_valid(self, general, specific):
+        """Returns True if (general, specific) is a valid resource type."""
+        return (general, specific) in self.valid
+
+
+@lru_cache(maxsize=None)
+def resource_type_registry():
+    """Returns the ResourceTypeRegistry, loaded once per process."""
+    return ResourceTypeRegistry()
+
+
 class ResourceTypeHierarchy(object):
-    """Hierarchy Mapping."""
+    """Hierarchy Mapping (see `ResourceTypeRegistry`)."""
 
     def __init__(self):
         """Constructor."""
-        self.filename = join(
-            dirname(realpath(__file__)), 'data', 'resource_type_mapping.csv'
-        )
-        with open(self.filename) as f:
-            reader = csv.DictReader(f)
-            self.map = {
-                (row['Group'].lower(), row['Name'].lower()):
-                [
-                    e.strip().lower() for e in row['Hierarchy'].split(",")
-                ] + [row['Name'].lower()]
-                for row in reader
-            }
+        self.map = resource_type_registry().hierarchy
 
     def get(self, key, default=None):
-        """Return the mapped value.
+        """Return the mapped value, a new list.
 
         `key` is (<general resource type>, <specific resource type>).
         """
-        return self.map.get(key, default)
+        hierarchy = self.map.get(key)
+        return list(hierarchy) if hierarchy is not None else default
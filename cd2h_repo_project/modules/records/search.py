@@ -4,15 +4,18 @@ NOTE: In all search cases, the output from the index is serialized into JSON
       as defined by json_v1_search in modules.records.serializers.
 """
 
+import json
+
 from elasticsearch_dsl import Q, TermsFacet
-from flask import has_request_context
+from elasticsearch_dsl.response import Response
+from flask import current_app, has_request_context
 from flask_login import current_user
 from flask_principal import ActionNeed
-from invenio_access import Permission
 from invenio_search import RecordsSearch as _RecordsSearch
 from invenio_search.api import DefaultFilter
 
 from cd2h_repo_project.modules.records.permissions import RecordPermissions
+from cd2h_repo_project.utils import is_allowed
 
 
 def nested_filter(path, field):
@@ -41,7 +44,7 @@ def records_filter():
     """
     if not has_request_context():
         return Q()
-    elif Permission(ActionNeed('admin-access')).can():
+    elif is_allowed(ActionNeed('admin-access'), current_user):
         return Q()
     elif not current_user.is_authenticated:
         return (
@@ -76,6 +79,28 @@ class RecordsSearch(_RecordsSearch):
         }
         default_filter = DefaultFilter(records_filter)
 
+    def execute(self, ignore_cache=False):
+        """Execute the search, coalesced with identical searches in flight.
+
+        The request includes the permission filter of the current user
+        (see `records_filter`), so only searches with the same effective
+        filter share a response. See `utils.SingleFlight`.
+        """
+        records = current_app.extensions.get('cd2h-records')
+        flight = getattr(records, 'search_flight', None)
+        if flight is None:
+            return super(RecordsSearch, self).execute(ignore_cache)
+
+        key = 'records:' + json.dumps(
+            [self._index, self._params, self.to_dict()],
+            sort_keys=True, default=str
+        )
+        response = flight.do(
+            key,
+            lambda: super(RecordsSearch, self).execute(ignore_cache).to_dict()
+        )
+        return Response(self, response)
+
 
 def owned_deposits_filter():
     """Query ElasticSearch for a filtered list of owned Deposits.
@@ -9,16 +9,22 @@ from invenio_records_rest.serializers.response import (
 
 from ..marshmallow import CSLRecordSchemaV1, RecordSchemaV1
 from .json import MenRvaJSONSerializer
+from .projections import record_hit_v1
 
 # Serializers
 # ===========
 #: JSON serializer definition.
 json_v1 = MenRvaJSONSerializer(RecordSchemaV1, replace_refs=True)
+#: JSON serializer definition with search hits projected from their source.
+json_v1_projected = MenRvaJSONSerializer(
+    RecordSchemaV1, replace_refs=True, hit_projection=record_hit_v1
+)
+
+#: CSL-JSON serializer definition.
+csl_v1 = MenRvaJSONSerializer(CSLRecordSchemaV1, replace_refs=True)
 
 #: CSL Citation Formatter serializer
-citeproc_v1 = CiteprocSerializer(
-    MenRvaJSONSerializer(CSLRecordSchemaV1, replace_refs=True)
-)
+citeproc_v1 = CiteprocSerializer(csl_v1)
 
 
 # Records-REST serializers
@@ -27,10 +33,17 @@ citeproc_v1 = CiteprocSerializer(
 json_v1_response = record_responsify(json_v1, 'application/json')
 #: JSON record serializer for search results.
 json_v1_search = search_responsify(json_v1, 'application/json')
+#: JSON serializer for search results with search hits projected.
+json_v1_projected_search = search_responsify(
+    json_v1_projected, 'application/json'
+)
 
 __all__ = (
     'citeproc_v1',
+    'csl_v1',
     'json_v1',
+    'json_v1_projected',
+    'json_v1_projected_search',
     'json_v1_response',
     'json_v1_search',
 )
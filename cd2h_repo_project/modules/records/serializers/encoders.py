@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""JSON encoding of serialized records.
+
+Records and search results are encoded by the RECORDS_JSON_ENCODER backend:
+
+- 'json' (default): `flask.json.dumps`;
+- 'orjson': orjson, for compact output. Keys are sorted (JSON_SORT_KEYS) and
+  non-ASCII characters escaped (JSON_AS_ASCII) like `flask.json` does, so the
+  same bytes are output. Values orjson can't encode as `flask.json` does
+  (e.g. datetimes, integers over 64 bits, non-string keys) are handed to
+  `flask.json`. Indented output (`?prettyprint=1`) always goes through
+  `flask.json`.
+
+orjson is not a dependency: it needs Python 3.7+. If it is not installed,
+`flask.json` is used.
+
+NOTE: orjson writes floats in their shortest form: exponents differ from
+      `repr` (1e16 vs 1e+16) and NaN/Infinity are written as null. None of
+      the records fields are floats.
+"""
+
+import re
+from functools import lru_cache
+
+from flask import current_app, json
+
+NON_ASCII = re.compile('[^\x00-\x7e]+')
+"""Runs of characters `json.dumps(..., ensure_ascii=True)` escapes."""
+
+
+def _escape_character(character):
+    """Return the JSON escape of a character (see NON_ASCII)."""
+    code = ord(character)
+    if code > 0xffff:
+        code -= 0x10000
+        return '\\u{:04x}\\u{:04x}'.format(
+            0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff)
+        )
+    return '\\u{:04x}'.format(code)
+
+
+@lru_cache(maxsize=4096)
+def _escape(characters):
+    """Return the JSON escapes of a run of NON_ASCII characters."""
+    return ''.join(_escape_character(c) for c in characters)
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    """Return the orjson module or None if it is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        current_app.logger.warning(
+            "RECORDS_JSON_ENCODER is 'orjson' but orjson is not installed: "
+            "falling back to flask.json."
+        )
+        return None
+    return orjson
+
+
+def _orjson_dumps(orjson, obj):
+    """Return `obj` in compact JSON as `flask.json.dumps` does."""
+    option = orjson.OPT_PASSTHROUGH_DATETIME
+    if current_app.config['JSON_SORT_KEYS']:
+        option |= orjson.OPT_SORT_KEYS
+
+    text = orjson.dumps(
+        obj, default=current_app.json_encoder().default, option=option
+    ).decode('utf-8')
+
+    if current_app.config['JSON_AS_ASCII']:
+        text = to_ascii(text)
+    return text
+
+
+def to_ascii(text):
+    """Return JSON `text` with non-ASCII characters escaped.
+
+    Same output as `json.dumps(..., ensure_ascii=True)`.
+    """
+    return NON_ASCII.sub(lambda match: _escape(match.group()), text)
+
+
+def is_compact(kwargs):
+    """Return True if `kwargs` of `json.dumps` ask for compact output."""
+    return (
+        kwargs.get('indent') is None and
+        tuple(kwargs.get('separators') or ()) == (',', ':')
+    )
+
+
+def json_dumps(obj, **kwargs):
+    """Return `obj` in JSON, as `flask.json.dumps(obj, **kwargs)` does.
+
+    :param obj: Object to encode.
+    :param kwargs: Keyword arguments of `flask.json.dumps`.
+    """
+    if (current_app.config['RECORDS_JSON_ENCODER'] == 'orjson' and
+            is_compact(kwargs)):
+        orjson = _orjson()
+        if orjson:
+            try:
+                return _orjson_dumps(orjson, obj)
+            except TypeError:
+                # orjson.JSONEncodeError: let flask.json encode it (or fail)
+                pass
+
+    return json.dumps(obj, **kwargs)
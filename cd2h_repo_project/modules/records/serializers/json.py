@@ -7,94 +7,138 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """menRva JSON serializer."""
-from copy import deepcopy
 
-from flask import json
+from invenio_records_rest.schemas import RecordSchemaJSONV1
 from invenio_records_rest.serializers.json import JSONSerializer
 
+from .encoders import json_dumps
+
 
 class MenRvaJSONSerializer(JSONSerializer):
     """Custom JSON serializer.
 
-    Used to modify the search aggregation results for now.
+    Used to modify the search aggregation results, to encode with the
+    configured JSON encoder (see `encoders`) and, optionally, to serialize
+    search hits with a projection (see `projections`) rather than with the
+    marshmallow schema.
     """
 
+    def __init__(self, schema_class=RecordSchemaJSONV1, hit_projection=None,
+                 **kwargs):
+        """Constructor.
+
+        :param schema_class: Marshmallow schema of records.
+        :param hit_projection: Function building the same output as
+                               `schema_class` from a search hit. Search hits
+                               are dumped with `schema_class` if None.
+        """
+        super(MenRvaJSONSerializer, self).__init__(schema_class, **kwargs)
+        self.hit_projection = hit_projection
+
+    def serialize(self, pid, record, links_factory=None, **kwargs):
+        """Serialize a single record and persistent identifier.
+
+        Overrides parent's serialize to use the configured JSON encoder.
+
+        :param pid: Persistent identifier instance.
+        :param record: Record instance.
+        :param links_factory: Factory function for record links.
+        """
+        return json_dumps(
+            self.transform_record(pid, record, links_factory, **kwargs),
+            **self._format_args()
+        )
+
+    def transform_search_hit(self, pid, record_hit, links_factory=None,
+                             **kwargs):
+        """Transform search result hit into an intermediate representation.
+
+        Overrides parent's transform_search_hit to use the hit projection if
+        there is one.
+        """
+        if self.hit_projection is None:
+            return super(MenRvaJSONSerializer, self).transform_search_hit(
+                pid, record_hit, links_factory=links_factory, **kwargs
+            )
+        return self.hit_projection(
+            pid, record_hit, links_factory=links_factory, **kwargs
+        )
+
     def transform_aggregation(self, aggregation):
-        """Conform aggregation to front-end format."""
-        new_aggregation = self.transform_subjects_aggregation(aggregation)
-        new_aggregation = self.transform_authors_aggregation(new_aggregation)
-        return new_aggregation
-
-    def transform_subjects_aggregation(self, aggregation):
-        """Conform 'subjects' aggregation to front-end format."""
-        if not aggregation or 'subjects' not in aggregation:
-            return aggregation
+        """Conform aggregation to front-end format.
 
-        transformed_aggregation = deepcopy(aggregation)
+        Only the 'subjects' and 'authors' entries are rebuilt, the other
+        entries are shared with `aggregation`, which is left unmodified.
+        """
+        if not aggregation:
+            return aggregation
 
-        def buckets(container):
-            """Generate output buckets from container with 'buckets' key."""
-            in_buckets = container.get('buckets', [])
-            out_buckets = []
+        transformed_aggregation = dict(aggregation)
+        if 'subjects' in aggregation:
+            transformed_aggregation['subjects'] = self.transform_subjects(
+                aggregation['subjects']
+            )
+        if 'authors' in aggregation:
+            transformed_aggregation['authors'] = self.transform_authors(
+                aggregation['authors']
+            )
+        return transformed_aggregation
 
-            for in_bucket in in_buckets:
-                out_bucket = {
-                    'doc_count': in_bucket['record_count']['doc_count'],
-                    'key': in_bucket['key']
+    @classmethod
+    def _subject_buckets(cls, container):
+        """Return output buckets from container with 'buckets' key."""
+        out_buckets = []
+
+        for in_bucket in container.get('buckets', []):
+            out_bucket = {
+                'doc_count': in_bucket['record_count']['doc_count'],
+                'key': in_bucket['key']
+            }
+
+            # Potential TODO: allow 'value' to be arbitrary since we only
+            #                 care about inner presence of 'buckets'
+            sub_category = 'subject'
+            sub_container = in_bucket.get(sub_category, {})
+            if sub_container:
+                out_bucket[sub_category] = {
+                    'buckets': cls._subject_buckets(sub_container),
+                    'doc_count_error_upper_bound': (
+                        sub_container.get('doc_count_error_upper_bound', 0)
+                    ),
+                    'sum_other_doc_count': (
+                        sub_container.get('sum_other_doc_count', 0)
+                    )
                 }
 
-                # Potential TODO: allow 'value' to be arbitrary since we only
-                #                 care about inner presence of 'buckets'
-                sub_category = 'subject'
-                sub_container = in_bucket.get(sub_category, {})
-                if sub_container:
-                    out_bucket[sub_category] = {
-                        'buckets': buckets(sub_container),
-                        'doc_count_error_upper_bound': (
-                            sub_container.get('doc_count_error_upper_bound', 0)
-                        ),
-                        'sum_other_doc_count': (
-                            sub_container.get('sum_other_doc_count', 0)
-                        )
-                    }
-
-                out_buckets.append(out_bucket)
-
-            return out_buckets
-
-        source = transformed_aggregation['subjects'].get('source', {})
-        transformed_aggregation['subjects'] = {
-            "buckets": buckets(source),
+            out_buckets.append(out_bucket)
+
+        return out_buckets
+
+    def transform_subjects(self, subjects):
+        """Conform 'subjects' aggregation entry to front-end format."""
+        source = subjects.get('source', {})
+        return {
+            "buckets": self._subject_buckets(source),
             "doc_count_error_upper_bound": (
                 source.get('doc_count_error_upper_bound', 0)
             ),
             "sum_other_doc_count": source.get('sum_other_doc_count', 0)
         }
 
-        return transformed_aggregation
+    def transform_authors(self, authors):
+        """Conform 'authors' aggregation entry to front-end format.
 
-    def transform_authors_aggregation(self, aggregation):
-        """Conform 'authors' aggregation to front-end format."""
-        if not aggregation or 'authors' not in aggregation:
-            return aggregation
-
-        transformed_aggregation = deepcopy(aggregation)
-        authors_aggregation = transformed_aggregation['authors']
-
-        key = next(
+        The nested terms aggregation (the entry with buckets) is returned as
+        is.
+        """
+        return next(
             (
-                key for key in authors_aggregation
-                if type(authors_aggregation[key]) is dict and
-                authors_aggregation[key].get('buckets')
+                value for value in authors.values()
+                if type(value) is dict and value.get('buckets')
             ),
-            None
+            authors
         )
 
-        if key:
-            transformed_aggregation['authors'] = authors_aggregation[key]
-
-        return transformed_aggregation
-
     def serialize_search(self, pid_fetcher, search_result, links=None,
                          item_links_factory=None, **kwargs):
         """Serialize a search result.
@@ -127,4 +171,4 @@ class MenRvaJSONSerializer(JSONSerializer):
             )
         }
 
-        return json.dumps(hits_dict, **self._format_args())
+        return json_dumps(hits_dict, **self._format_args())
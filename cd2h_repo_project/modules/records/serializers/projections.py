@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Projections of search hits.
+
+A projection builds the serialized form of a search hit straight from its
+Elasticsearch `_source`. It outputs what the marshmallow dump of the hit
+would, without instantiating schemas and going through their fields for
+every hit of a page.
+
+WARNING: Any change to `RecordSchemaV1` (and its nested schemas) should be
+         reflected in `record_hit_v1`. tests/api/records/test_serializers.py
+         checks they produce the same output.
+"""
+
+METADATA_TEXTS = ('title', 'description', 'license', 'type', 'permissions')
+AUTHOR_TEXTS = ('first_name', 'middle_name', 'last_name', 'full_name')
+RESOURCE_TYPE_TEXTS = ('general', 'specific')
+TERM_TEXTS = ('source', 'value', 'id')
+
+
+def _text(value):
+    """Return `value` as marshmallow's `fields.Str` dumps it."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return str(value)
+
+
+def _texts(obj, keys):
+    """Return dict of the `keys` of `obj` dumped as text.
+
+    Absent keys are left out, like marshmallow does.
+    """
+    obj = obj or {}
+    return {key: _text(obj[key]) for key in keys if key in obj}
+
+
+def _nested_texts(objs, keys):
+    """Return list of `_texts` of `objs` (a `many=True` nested field)."""
+    if objs is None:
+        return None
+    return [_texts(obj, keys) for obj in objs]
+
+
+def _resource_type(resource_type):
+    if resource_type is None:
+        return None
+    result = _texts(resource_type, RESOURCE_TYPE_TEXTS)
+    if 'full_hierarchy' in resource_type:
+        hierarchy = resource_type['full_hierarchy']
+        if hierarchy is None:
+            result['full_hierarchy'] = None
+        else:
+            if not isinstance(hierarchy, (list, tuple)):
+                hierarchy = [hierarchy]
+            result['full_hierarchy'] = [_text(h) for h in hierarchy]
+    return result
+
+
+def record_hit_v1(pid, record_hit, links_factory=None, **kwargs):
+    """Return `record_hit` as `RecordSchemaV1` dumps it.
+
+    Same signature as `transform_search_hit` of the serializers. Unlike
+    `preprocess_search_hit`, `record_hit` is not modified.
+    """
+    source = record_hit['_source']
+    links_factory = links_factory or (lambda x, **k: dict())
+    context_pid = kwargs.get('marshmallow_context', {}).get('pid', pid)
+
+    metadata = _texts(source, METADATA_TEXTS)
+    if 'authors' in source:
+        metadata['authors'] = _nested_texts(source['authors'], AUTHOR_TEXTS)
+    if 'resource_type' in source:
+        metadata['resource_type'] = _resource_type(source['resource_type'])
+    if 'terms' in source:
+        metadata['terms'] = _nested_texts(source['terms'], TERM_TEXTS)
+
+    hit = {
+        'metadata': metadata,
+        'links': links_factory(pid, record_hit=record_hit, **kwargs),
+        'created': _text(source.get('_created')),
+        'updated': _text(source.get('_updated')),
+    }
+    if context_pid:
+        hit['id'] = metadata['id'] = context_pid.pid_value
+    return hit
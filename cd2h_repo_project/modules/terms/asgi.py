@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous term suggestion service (optional).
+
+An ASGI application serving the suggestion endpoints of the terms API
+(`/_suggest`, `/mesh/_suggest` and `/fast/_suggest` under TERMS_ASGI_PREFIX)
+with the same requests and responses as `views`. The deposit form asks for
+suggestions on every keystroke: here, all of them are multiplexed on one
+event loop and one pool of connections to Elasticsearch, instead of each
+holding a uWSGI worker while Elasticsearch answers.
+
+It needs an ASGI server and, unless TERMS_SUGGEST_BACKEND is 'prefix_index',
+the `elasticsearch-async` client (the `asgi` extra):
+
+    pip install -e .[asgi]
+    uvicorn cd2h_repo_project.modules.terms.asgi:application --port 5002
+
+Suggestion requests are then routed to it by nginx (see the `terms_server`
+upstream in docker/nginx/conf.d/default.conf). Users are authenticated by
+their session cookie, which is opened by the session interface of the API
+application, in a thread.
+"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from elasticsearch.exceptions import NotFoundError, TransportError
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import HTTP_STATUS_CODES
+
+from .cache import (
+    SuggestionCache, ThrottledValue, normalize_key, suggestion_etag
+)
+from .constants import FAST_SOURCE, MESH_SOURCE
+from .indexer import mappings_version
+from .loaders import ALIAS, DOC_TYPE
+from .suggester import (
+    add_infix_terms, completion_search, completion_terms, infix_searches,
+    prefix_index_terms
+)
+from .views import MAX_BATCH_SIZE, batch_query, suggestion_limit
+
+ROUTES = {
+    '/_suggest': None,
+    '/mesh/_suggest': MESH_SOURCE,
+    '/fast/_suggest': FAST_SOURCE,
+}
+"""Path (relative to TERMS_ASGI_PREFIX) -> source of the suggestions."""
+
+MAX_BODY_SIZE = 64 * 1024
+"""Maximum size in bytes of a batch suggestion request."""
+
+
+def _headers(scope):
+    """Return dict of lowercased header name -> value of `scope`."""
+    headers = {}
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').lower()
+        value = value.decode('latin-1')
+        if name in headers:
+            separator = '; ' if name == 'cookie' else ', '
+            value = headers[name] + separator + value
+        headers[name] = value
+    return headers
+
+
+def _if_none_match(header):
+    """Return set of the entity tags of an If-None-Match `header`."""
+    return {
+        tag.strip().replace('W/', '', 1).strip('"')
+        for tag in header.split(',') if tag.strip()
+    }
+
+
+def _to_int(value):
+    """Return `value` as an int or None (like `request.args.get(type=int)`)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _read_body(receive):
+    """Return request body or None if it is larger than MAX_BODY_SIZE."""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if len(body) > MAX_BODY_SIZE:
+            return None
+    return body
+
+
+class SuggestApp(object):
+    """ASGI application of the term suggestion endpoints."""
+
+    def __init__(self, flask_app=None, es=None):
+        """Constructor.
+
+        :param flask_app: API application. Created on first use if None.
+        :param es: asynchronous Elasticsearch client. Created on first use
+                   if None.
+        """
+        self._flask_app = flask_app
+        self._es = es
+        self._version = ThrottledValue()
+        self.prefix = None
+        self.suggestion_cache = None
+
+    @property
+    def flask_app(self):
+        """API application (configuration, extensions and sessions)."""
+        if self._flask_app is None:
+            from invenio_app.factory import create_api
+            self._flask_app = create_api()
+        return self._flask_app
+
+    @property
+    def config(self):
+        """Configuration of the API application."""
+        return self.flask_app.config
+
+    @property
+    def es(self):
+        """Asynchronous Elasticsearch client, shared by all requests."""
+        if self._es is None:
+            from elasticsearch_async import AsyncElasticsearch
+            self._es = AsyncElasticsearch(
+                self.config.get('SEARCH_ELASTIC_HOSTS'),
+                maxsize=self.config['TERMS_ASGI_ES_MAXSIZE']
+            )
+        return self._es
+
+    def setup(self):
+        """Initialize the application from the configuration (once)."""
+        if self.prefix is not None:
+            return
+
+        config = self.config
+        self.prefix = config['TERMS_ASGI_PREFIX'].rstrip('/')
+        if config['TERMS_SUGGEST_CACHE_ENABLED']:
+            # All suggestions are served by this process: no need for Redis
+            self.suggestion_cache = SuggestionCache(
+                lambda: self._version.value,
+                maxsize=config['TERMS_SUGGEST_CACHE_SIZE'],
+                ttl=config['TERMS_SUGGEST_CACHE_TTL'],
+                generation_interval=0,
+            )
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        self.setup()
+        try:
+            status, headers, body = await self.handle(scope, receive)
+        except Exception:
+            self.flask_app.logger.exception('Could not suggest terms.')
+            status, headers, body = self.error(500)
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (name.encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def lifespan(self, receive, send):
+        """Set up on server startup and close connections on shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.setup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._es is not None:
+                    await self._es.transport.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle(self, scope, receive):
+        """Return (status, headers, body) of a request."""
+        path = scope['path']
+        route = path[len(self.prefix):] if path.startswith(self.prefix) \
+            else None
+        if route not in ROUTES:
+            return self.error(404)
+
+        method = scope['method']
+        if method != 'GET' and not (method == 'POST' and route == '/_suggest'):
+            return self.error(405)
+
+        headers = _headers(scope)
+        if not await self.authenticated(headers.get('cookie', '')):
+            return self.error(401)
+
+        if method == 'POST':
+            return await self.batch_suggest(await _read_body(receive))
+
+        args = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        return await self.suggest(
+            args.get('q', [''])[0],
+            ROUTES[route],
+            suggestion_limit(_to_int(args.get('limit', [None])[0])),
+            headers.get('if-none-match', '')
+        )
+
+    async def authenticated(self, cookie):
+        """Return True if the session of `cookie` is of a logged in user."""
+        if self.flask_app.session_cookie_name not in cookie:
+            return False
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._authenticate, cookie)
+
+    def _authenticate(self, cookie):
+        """Return True if the session of `cookie` is of a logged in user.
+
+        Blocking: the session is opened by the session interface of the API
+        application (e.g. loaded from the session store), as it would be for
+        a request with this cookie. Flask-Login keeps the id of the logged in
+        user in it.
+        """
+        app = self.flask_app
+        request = app.request_class({'HTTP_COOKIE': cookie})
+        with app.app_context():
+            session = app.session_interface.open_session(app, request)
+        return session is not None and session.get('user_id') is not None
+
+    async def suggest(self, q, source, limit, if_none_match=''):
+        """Return (status, headers, body) of term suggestions.
+
+        Like `views.suggest`, conditional requests of the current vocabulary
+        version get a 304 without any lookup.
+        """
+        version = await self.vocabulary_version()
+        etag = suggestion_etag(version, q, source, limit)
+        headers = [
+            ('etag', '"{}"'.format(etag)),
+            ('cache-control', 'private, max-age={}'.format(
+                self.config['TERMS_SUGGEST_MAX_AGE'])),
+        ]
+
+        tags = _if_none_match(if_none_match)
+        if etag in tags or '*' in tags:
+            return 304, headers, b''
+
+        terms = await self.suggest_terms_batch({'terms': (q, source, limit)})
+        return self.json({'terms': terms['terms']}, headers)
+
+    async def batch_suggest(self, body):
+        """Return (status, headers, body) of batched term suggestions.
+
+        See `views.batch_suggest`.
+        """
+        try:
+            queries = json.loads(body.decode('utf-8'))
+        except (AttributeError, ValueError):
+            queries = None
+        if not isinstance(queries, dict) or len(queries) > MAX_BATCH_SIZE:
+            return self.error(400)
+
+        try:
+            queries = {
+                name: batch_query(query) for name, query in queries.items()
+            }
+        except HTTPException as e:
+            return self.error(e.code)
+
+        return self.json({'terms': await self.suggest_terms_batch(queries)})
+
+    async def vocabulary_version(self):
+        """Version of the vocabulary suggestions are made from.
+
+        See `ext.Terms.vocabulary_version`.
+        """
+        if self.config['TERMS_SUGGEST_BACKEND'] == 'prefix_index':
+            with self.flask_app.app_context():
+                terms = self.flask_app.extensions['menrva-terms']
+                return terms.vocabulary_version
+
+        return await self._version.get_async(
+            self._fetch_vocabulary_version,
+            self.config['TERMS_VOCABULARY_VERSION_INTERVAL']
+        )
+
+    async def _fetch_vocabulary_version(self):
+        """Return vocabulary version (see `indexer.vocabulary_version`)."""
+        try:
+            mappings = await self.es.indices.get_mapping(
+                index=ALIAS, doc_type=DOC_TYPE
+            )
+        except NotFoundError:
+            mappings = {}
+        return mappings_version(mappings)
+
+    async def suggest_terms_batch(self, queries):
+        """Return front-end consumable suggestions of several queries.
+
+        See `suggester.suggest_terms_batch`.
+
+        :param queries: dict of name -> (query, source, limit).
+        """
+        if self.config['TERMS_SUGGEST_BACKEND'] == 'prefix_index':
+            with self.flask_app.app_context():
+                terms = self.flask_app.extensions['menrva-terms']
+                return prefix_index_terms(terms.prefix_index, queries)
+
+        await self.vocabulary_version()
+        cache = self.suggestion_cache
+        if cache is None:
+            return await self._suggest_terms(queries)
+
+        keys = {name: normalize_key(*query) for name, query in queries.items()}
+        results = {name: cache.get(key) for name, key in keys.items()}
+        misses = {
+            name: queries[name] for name, terms in results.items()
+            if terms is None
+        }
+
+        if misses:
+            for name, terms in (await self._suggest_terms(misses)).items():
+                cache.set(keys[name], terms)
+                results[name] = terms
+
+        return results
+
+    async def _suggest_terms(self, queries):
+        """Return ES value suggestions of queries.
+
+        The requests of `suggester._suggest_terms`, sent asynchronously.
+        """
+        response = await self.es.search(
+            index='terms', body=completion_search(queries).to_dict()
+        )
+        terms = completion_terms(queries, response)
+
+        searches = infix_searches(queries, terms)
+        if searches:
+            body = []
+            for _, search in searches:
+                body.extend([{}, search.to_dict()])
+            responses = await self.es.msearch(index='terms', body=body)
+            for response in responses['responses']:
+                if 'error' in response:
+                    raise TransportError('N/A', 'msearch', response['error'])
+            add_infix_terms(terms, searches, responses['responses'])
+
+        return terms
+
+    def json(self, data, headers=()):
+        """Return (status, headers, body) of a JSON response."""
+        body = json.dumps(data).encode('utf-8')
+        return 200, [
+            ('content-type', 'application/json'),
+            ('content-length', str(len(body))),
+        ] + list(headers), body
+
+    def error(self, status):
+        """Return (status, headers, body) of an error response."""
+        _, headers, body = self.json({
+            'status': status, 'message': HTTP_STATUS_CODES[status]
+        })
+        return status, headers, body
+
+
+application = SuggestApp()
+"""ASGI application, the API application is created on first use."""
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cache of term suggestions.
+
+The deposit form asks for suggestions on every keystroke and prefixes are
+very repetitive across users. Suggestions are kept in a bounded in-process
+LRU cache with a TTL, optionally backed by a Redis shared by all processes.
+
+Entries belong to a *generation*: the version of the served vocabulary
+(see `indexer.vocabulary_version`). When the terms alias is swapped or terms
+are loaded, the generation changes and previous entries are dropped.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_key(query, source, limit):
+    """Return cache key of a suggestion request.
+
+    Completion suggestions are case-insensitive, so is the key.
+    """
+    return '{source}:{limit}:{query}'.format(
+        source=source or '', limit=limit, query=query.lower()
+    )
+
+
+def suggestion_etag(version, query, source, limit):
+    """Return ETag of the suggestions of a query for a vocabulary version."""
+    content = '{version}|{key}'.format(
+        version=version, key=normalize_key(query, source, limit)
+    )
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class SuggestionCache(object):
+    """LRU + TTL cache of suggestions, invalidated by generation."""
+
+    REDIS_PREFIX = 'menrva:terms:suggest'
+
+    def __init__(self, get_generation, maxsize=4096, ttl=300,
+                 generation_interval=10, redis_url=None, clock=time.time):
+        """Constructor.
+
+        :param get_generation: callable returning the current generation.
+        :param maxsize: maximum number of in-process entries.
+        :param ttl: seconds an entry is served for.
+        :param generation_interval: seconds between generation checks.
+        :param redis_url: URL of a Redis shared by all processes (optional).
+        :param clock: callable returning the current time in seconds.
+        """
+        self.get_generation = get_generation
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation_interval = generation_interval
+        self.clock = clock
+        self.redis = None
+        if redis_url:
+            from redis import StrictRedis
+            self.redis = StrictRedis.from_url(redis_url)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_checked = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self):
+        """Current generation, checked at most every interval."""
+        now = self.clock()
+        with self._lock:
+            due = (
+                self._generation_checked is None or
+                now - self._generation_checked >= self.generation_interval
+            )
+        if due:
+            generation = self.get_generation()
+            with self._lock:
+                if generation != self._generation:
+                    self._entries.clear()
+                    self._generation = generation
+                self._generation_checked = now
+        return self._generation
+
+    def _redis_key(self, generation, key):
+        return '{prefix}:{generation}:{key}'.format(
+            prefix=self.REDIS_PREFIX, generation=generation, key=key
+        )
+
+    def _get_local(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key, value, now):
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return cached value of `key` or None."""
+        generation = self.generation
+        now = self.clock()
+
+        value = self._get_local(key, now)
+        if value is None and self.redis is not None:
+            data = self.redis.get(self._redis_key(generation, key))
+            if data is not None:
+                value = json.loads(data.decode('utf-8'))
+                self._set_local(key, value, now)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Cache JSON-serializable `value` under `key`."""
+        generation = self.generation
+        self._set_local(key, value, self.clock())
+        if self.redis is not None:
+            self.redis.setex(
+                self._redis_key(generation, key), self.ttl, json.dumps(value)
+            )
+
+    def get_or_set(self, key, compute):
+        """Return cached value of `key`, caching `compute()` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop in-process entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._generation_checked = None
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return dict of cache statistics (of this process)."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'generation': self._generation,
+                'redis': self.redis is not None,
+            }
+
+
+class ThrottledValue(object):
+    """Value fetched again at most every `interval` seconds.
+
+    Used for the vocabulary version, which is checked on every suggestion
+    request. While a fetch is in progress, concurrent callers get the
+    current value.
+    """
+
+    def __init__(self, clock=time.time):
+        """Constructor."""
+        self.value = None
+        self._checked = None
+        self._clock = clock
+
+    def _due(self, interval):
+        """Return True if the value should be fetched again (and mark it)."""
+        now = self._clock()
+        if (self.value is not None and self._checked is not None and
+                now - self._checked < interval):
+            return False
+        self._checked = now
+        return True
+
+    def get(self, fetch, interval):
+        """Return the value, from `fetch()` if due.
+
+        :param fetch: callable returning the value.
+        :param interval: minimum number of seconds between fetches.
+        """
+        if self._due(interval):
+            try:
+                self.value = fetch()
+            except Exception:
+                self._checked = None
+                raise
+        return self.value
+
+    async def get_async(self, fetch, interval):
+        """Return the value, awaited from `fetch()` if due (see `get`)."""
+        if self._due(interval):
+            try:
+                self.value = await fetch()
+            except Exception:
+                self._checked = None
+                raise
+        return self.value
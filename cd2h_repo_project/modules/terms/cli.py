@@ -6,18 +6,182 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """MeSH cli commands."""
+import time
+from collections import Counter
 from os.path import dirname, join, realpath
 
 import click
-from elasticsearch.helpers import bulk
+from flask import current_app
 from flask.cli import with_appcontext
 from invenio_search import current_search_client
 
+from . import prefix_index, snapshot
+from .constants import FAST_SOURCE, MESH_SOURCE
 from .fast import FAST
-from .loaders import fast_indexable, mesh_indexable
+from .indexer import (
+    CHUNK_SIZE, MAX_CHUNK_BYTES, bulk_load_mode, bulk_results, count_by_source,
+    create_index, delete_indices, incremental_actions, new_index_name,
+    stamp_vocabulary_version, swap_aliases
+)
+from .loaders import (
+    ALIAS, DOC_TYPE, INDEX, fast_indexable, mesh_indexable, with_fingerprint
+)
 from .mesh import MeSH
 
 
+class Progress(object):
+    """Live progress line of a bulk load."""
+
+    def __init__(self, label, interval=0.5):
+        """Constructor."""
+        self.label = label
+        self.interval = interval
+        self.start = self.last_print = time.time()
+        self.successes = 0
+        self.errors = 0
+
+    @property
+    def total(self):
+        """Number of processed documents."""
+        return self.successes + self.errors
+
+    def line(self):
+        """Return progress line."""
+        elapsed = max(time.time() - self.start, 1e-6)
+        return (
+            '{label}: {total} docs ({rate:.0f} docs/s), {errors} errors'
+            .format(
+                label=self.label, total=self.total,
+                rate=self.total / elapsed, errors=self.errors
+            )
+        )
+
+    def update(self, ok):
+        """Count a result and refresh the progress line if due."""
+        if ok:
+            self.successes += 1
+        else:
+            self.errors += 1
+
+        now = time.time()
+        if now - self.last_print >= self.interval:
+            self.last_print = now
+            click.echo('\r' + self.line(), nl=False)
+
+    def error(self, item):
+        """Report a failed document on its own line."""
+        click.echo()
+        click.secho('Error: {}'.format(item), fg='red')
+
+
+def bulk_index(indexable_terms, label, source, index=INDEX, bulk_mode=None,
+               async_translog=False, **bulk_options):
+    """Stream `indexable_terms` into the index and report on progress.
+
+    Terms are consumed one chunk at a time, so an arbitrarily large
+    vocabulary can be indexed without holding it all in memory. Failures are
+    reported as they come back from Elasticsearch.
+
+    :param bulk_mode: if True or None (default), index is tuned for the
+                      load (see `indexer.bulk_load_mode`).
+    :param bulk_options: `chunk_size`, `max_chunk_bytes` and `threads` of
+                         `indexer.bulk_results`.
+    :returns: Progress of the load.
+    """
+    es = current_search_client
+    progress = Progress(label)
+    bulk_mode = True if bulk_mode is None else bulk_mode
+
+    with bulk_load_mode(es, index, bulk_mode, async_translog):
+        results = bulk_results(es, indexable_terms, **bulk_options)
+        for ok, item in results:
+            progress.update(ok)
+            if not ok:
+                progress.error(item)
+
+        click.echo('\r' + progress.line())
+
+    click.secho(
+        'Loaded {loaded}/{total} {label} from {source}'.format(
+            loaded=progress.successes, total=progress.total, label=label,
+            source=source),
+        fg='green'
+    )
+
+    return progress
+
+
+def with_bulk_options(command):
+    """Decorate `command` with the bulk indexing tuning options."""
+    options = [
+        click.option(
+            '--chunk-size', type=click.IntRange(min=1), default=CHUNK_SIZE,
+            help='Number of documents per bulk request.'
+        ),
+        click.option(
+            '--max-chunk-bytes', type=click.IntRange(min=1),
+            default=MAX_CHUNK_BYTES,
+            help='Maximum size in bytes of a bulk request.'
+        ),
+        click.option(
+            '--threads', '-t', type=click.IntRange(min=1), default=1,
+            help='Number of concurrent bulk requests.'
+        ),
+        click.option(
+            '--bulk-mode/--no-bulk-mode', default=None,
+            help='Suspend refreshes and replicas while loading. '
+                 'Default: on, except with --incremental.'
+        ),
+        click.option(
+            '--async-translog', is_flag=True, default=False,
+            help='Do not fsync the translog per request while loading.'
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+incremental_option = click.option(
+    '--incremental', is_flag=True, default=False,
+    help='Only send new, changed and removed terms.'
+)
+
+cache_option = click.option(
+    '--cache/--no-cache', default=True,
+    help='Reuse the parsed terms of an unchanged source.'
+)
+
+
+def incremental_index(indexables, source_name, label, source, **bulk_options):
+    """Bring live `source_name` terms in line with `indexables`.
+
+    Terms whose fingerprint didn't change are not sent to Elasticsearch.
+    Bulk mode is off unless asked for: suspending replicas on the live index
+    and force-merging it isn't worth it for a few changed terms.
+    """
+    if bulk_options.get('bulk_mode') is None:
+        bulk_options['bulk_mode'] = False
+
+    changes = Counter()
+    actions = incremental_actions(
+        current_search_client, indexables, source_name, changes=changes
+    )
+
+    bulk_index(actions, label, source, **bulk_options)
+
+    click.secho(
+        '{create} created, {update} updated, {delete} deleted, '
+        '{unchanged} unchanged'.format(
+            **{
+                key: changes[key]
+                for key in ['create', 'update', 'delete', 'unchanged']
+            }
+        ),
+        fg='green'
+    )
+
+
 @click.group()
 def terms():
     """Invenio-terms commands."""
@@ -33,39 +197,68 @@ def mesh():
 DEFAULT_MESH_FILE = join(dirname(realpath(__file__)), 'data', 'd2018.bin')
 
 
+def mesh_indexables(source, index=INDEX, workers=1, cache=True):
+    """Generate indexable MeSH topical headings from `source`.
+
+    :param cache: if True, parsed terms come from/go to a snapshot of
+                  `source` (see `snapshot.cached`).
+    """
+    def load():
+        return MeSH.stream(source, filter='topics', workers=workers)
+
+    terms = snapshot.cached(source, ['MeSH', 'topics'], load) \
+        if cache else load()
+    return (
+        with_fingerprint(mesh_indexable(t, index=index, doc_type=DOC_TYPE))
+        for t in terms
+    )
+
+
+def fast_indexables(source, index=INDEX, engine='scan', workers=1,
+                    cache=True):
+    """Generate indexable FAST topical headings from `source`.
+
+    :param cache: if True, parsed terms come from/go to a snapshot of
+                  `source` (see `snapshot.cached`).
+    """
+    def load():
+        return FAST.stream(source, engine=engine, workers=workers)
+
+    terms = snapshot.cached(source, ['FAST'], load) if cache else load()
+    return (
+        with_fingerprint(fast_indexable(t, index=index, doc_type=DOC_TYPE))
+        for t in terms
+    )
+
+
 @mesh.command('index')
 @click.option('--source', '-s', default=DEFAULT_MESH_FILE)
+@click.option(
+    '--workers', '-w', type=click.IntRange(min=1), default=1,
+    help='Number of processes parsing the source.'
+)
+@incremental_option
+@cache_option
+@with_bulk_options
 @with_appcontext
-def index_mesh(source):
+def index_mesh(source, workers, incremental, cache, **bulk_options):
     """Load MeSH terms to local index."""
     click.secho(
         'Loading MeSH topical headings from {}'.format(source), fg='blue'
     )
 
-    terms = MeSH.load(source, filter='topics')
+    indexables = mesh_indexables(source, workers=workers, cache=cache)
+    if incremental:
+        incremental_index(
+            indexables, MESH_SOURCE, 'MeSH topical headings', source,
+            **bulk_options
+        )
+    else:
+        bulk_index(
+            indexables, 'MeSH topical headings', source, **bulk_options
+        )
 
-    # Adapt to indexer
-    index_name = 'terms-term-v1.0.0'
-    type_name = 'term-v1.0.0'
-    indexable_terms = [
-        mesh_indexable(t, index=index_name, doc_type=type_name) for t in terms
-    ]
-
-    # Index them
-    es = current_search_client
-    successes, errors = bulk(es, indexable_terms)
-    es.indices.refresh(index=index_name)
-
-    click.secho(
-        'Loaded {loaded}/{total} MeSH topical headings from {source}'.format(
-            loaded=successes, total=len(indexable_terms), source=source),
-        fg='green'
-    )
-
-    if errors:
-        click.secho('Errors:', fg='red')
-        for error in errors:
-            click.secho('{}'.format(error), fg='red')
+    stamp_vocabulary_version(current_search_client)
 
 
 @terms.group()
@@ -79,34 +272,133 @@ NT_FAST_FILE = join(dirname(realpath(__file__)), 'data', 'FASTTopical.nt.zip')
 
 @fast.command('index')
 @click.option('--source', '-s', default=NT_FAST_FILE)
+@click.option(
+    '--engine', type=click.Choice(FAST.ENGINES), default='scan',
+    help="Parser: 'scan' (fast, streaming) or 'rdflib' (generic)."
+)
+@click.option(
+    '--workers', '-w', type=click.IntRange(min=1), default=1,
+    help='Number of processes parsing the source.'
+)
+@incremental_option
+@cache_option
+@with_bulk_options
 @with_appcontext
-def index_fast(source):
+def index_fast(source, engine, workers, incremental, cache,
+               **bulk_options):
     """Load FAST terms to local index."""
     click.secho(
         'Loading FAST topical headings from {}'.format(source), fg='blue'
     )
 
-    terms = FAST.load(source)
+    indexables = fast_indexables(
+        source, engine=engine, workers=workers, cache=cache
+    )
+    if incremental:
+        incremental_index(
+            indexables, FAST_SOURCE, 'FAST topical headings', source,
+            **bulk_options
+        )
+    else:
+        bulk_index(
+            indexables, 'FAST topical headings', source, **bulk_options
+        )
 
-    # Adapt to indexer
-    index_name = 'terms-term-v1.0.0'
-    type_name = 'term-v1.0.0'
-    indexable_terms = [
-        fast_indexable(t, index=index_name, doc_type=type_name) for t in terms
-    ]
+    stamp_vocabulary_version(current_search_client)
 
-    # Index them
+
+@terms.command('rebuild')
+@click.option('--mesh-source', default=DEFAULT_MESH_FILE)
+@click.option('--fast-source', default=NT_FAST_FILE)
+@click.option(
+    '--engine', type=click.Choice(FAST.ENGINES), default='scan',
+    help="FAST parser: 'scan' (fast, streaming) or 'rdflib' (generic)."
+)
+@click.option(
+    '--workers', '-w', type=click.IntRange(min=1), default=1,
+    help='Number of processes parsing each source.'
+)
+@click.option(
+    '--grace-period', type=click.IntRange(min=0), default=60,
+    help='Seconds to wait before deleting the old index.'
+)
+@cache_option
+@with_bulk_options
+@with_appcontext
+def rebuild(mesh_source, fast_source, engine, workers, grace_period, cache,
+            **bulk_options):
+    """Rebuild all terms in a new index and swap it in.
+
+    Suggestions keep being served from the old index until the new one is
+    loaded and validated.
+    """
     es = current_search_client
-    successes, errors = bulk(es, indexable_terms)
-    es.indices.refresh(index=index_name)
+    new_index = new_index_name()
+    create_index(es, new_index)
+    click.secho('Building terms in {}'.format(new_index), fg='blue')
+
+    try:
+        loads = {
+            MESH_SOURCE: bulk_index(
+                mesh_indexables(mesh_source, new_index, workers, cache),
+                'MeSH topical headings', mesh_source, index=new_index,
+                **bulk_options
+            ),
+            FAST_SOURCE: bulk_index(
+                fast_indexables(
+                    fast_source, new_index, engine, workers, cache
+                ),
+                'FAST topical headings', fast_source, index=new_index,
+                **bulk_options
+            ),
+        }
+
+        counts = count_by_source(es, new_index)
+        for source, progress in loads.items():
+            if progress.errors or counts.get(source, 0) != progress.total:
+                raise click.ClickException(
+                    '{source}: {count} indexed terms for {total} loaded '
+                    'terms ({errors} errors). {index} is left as is.'.format(
+                        source=source, count=counts.get(source, 0),
+                        total=progress.total, errors=progress.errors,
+                        index=ALIAS
+                    )
+                )
+
+        stamp_vocabulary_version(es, new_index)
+    except BaseException:
+        es.indices.delete(index=new_index, ignore=[404])
+        raise
 
+    old_indices = swap_aliases(es, new_index)
+    click.secho('{} now points to {}'.format(ALIAS, new_index), fg='green')
+
+    if old_indices:
+        click.secho(
+            'Deleting {} in {} seconds'.format(
+                ', '.join(old_indices), grace_period),
+            fg='blue'
+        )
+        time.sleep(grace_period)
+    delete_indices(es, old_indices, new_index)
+
+
+@terms.command('prefix-index')
+@click.option(
+    '--output', '-o', default=None,
+    help='Path of the index. Defaults to TERMS_PREFIX_INDEX_PATH.'
+)
+@with_appcontext
+def build_prefix_index(output):
+    """Build the local prefix index from the indexed terms."""
+    output = output or current_app.config['TERMS_PREFIX_INDEX_PATH']
     click.secho(
-        'Loaded {loaded}/{total} FAST topical headings from {source}'.format(
-            loaded=successes, total=len(indexable_terms), source=source),
-        fg='green'
+        'Building prefix index of {} in {}'.format(ALIAS, output), fg='blue'
     )
 
-    if errors:
-        click.secho('Errors:', fg='red')
-        for error in errors:
-            click.secho('{}'.format(error), fg='red')
+    terms = list(prefix_index.es_terms(current_search_client))
+    prefix_index.build(output, terms)
+
+    click.secho(
+        'Indexed {} terms in {}'.format(len(terms), output), fg='green'
+    )
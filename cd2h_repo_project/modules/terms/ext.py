@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Flask extension for terms."""
+
+import os
+import threading
+
+from flask import current_app
+from invenio_search import current_search_client
+from werkzeug.local import LocalProxy
+
+from cd2h_repo_project.utils import SingleFlight
+
+from .cache import SuggestionCache, ThrottledValue
+from .indexer import vocabulary_version
+from .prefix_index import PrefixIndex
+
+current_terms = LocalProxy(lambda: current_app.extensions['menrva-terms'])
+
+
+class Terms(object):
+    """Terms extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        app.extensions['menrva-terms'] = self
+        if not app.config.get('TERMS_PREFIX_INDEX_PATH'):
+            app.config['TERMS_PREFIX_INDEX_PATH'] = os.path.join(
+                app.instance_path, 'terms.prefix_index'
+            )
+        self._prefix_index = None
+        self._prefix_index_lock = threading.Lock()
+        self._version = ThrottledValue()
+        self.suggestion_cache = None
+        if app.config.get('TERMS_SUGGEST_CACHE_ENABLED'):
+            self.suggestion_cache = SuggestionCache(
+                lambda: self.vocabulary_version,
+                maxsize=app.config['TERMS_SUGGEST_CACHE_SIZE'],
+                ttl=app.config['TERMS_SUGGEST_CACHE_TTL'],
+                generation_interval=0,
+                redis_url=app.config.get('TERMS_SUGGEST_CACHE_REDIS_URL'),
+            )
+        self.suggestion_flight = None
+        if app.config.get('SEARCH_SINGLE_FLIGHT_ENABLED'):
+            self.suggestion_flight = SingleFlight(
+                redis_url=app.config.get('SEARCH_SINGLE_FLIGHT_REDIS_URL'),
+                timeout=app.config['SEARCH_SINGLE_FLIGHT_TIMEOUT'],
+            )
+
+    @property
+    def prefix_index(self):
+        """Prefix index, reopened when its file is replaced.
+
+        It is opened on first use, i.e. in each (forked) worker. Workers
+        share the pages of the memory-mapped file.
+        """
+        path = current_app.config['TERMS_PREFIX_INDEX_PATH']
+        mtime = os.stat(path).st_mtime
+
+        with self._prefix_index_lock:
+            index = self._prefix_index
+            if index is None or index.path != path or index.mtime != mtime:
+                self._prefix_index = index = PrefixIndex(path)
+        return index
+
+    @property
+    def vocabulary_version(self):
+        """Version of the vocabulary suggestions are made from.
+
+        The Elasticsearch version is checked at most every
+        TERMS_VOCABULARY_VERSION_INTERVAL seconds.
+        """
+        if current_app.config['TERMS_SUGGEST_BACKEND'] == 'prefix_index':
+            return 'prefix_index:{}'.format(self.prefix_index.mtime)
+
+        return self._version.get(
+            lambda: vocabulary_version(current_search_client),
+            current_app.config['TERMS_VOCABULARY_VERSION_INTERVAL']
+        )
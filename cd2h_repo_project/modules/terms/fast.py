@@ -18,11 +18,41 @@ https://www.oclc.org/research/themes/data-science/fast/download.html
 
 import re
 import zipfile
+from collections import namedtuple
+from functools import partial
+from io import BytesIO
 from zipfile import ZipFile
 
 from rdflib.namespace import DCTERMS, SKOS
 from rdflib.plugins.parsers.ntriples import NTriplesParser
 
+from .parallel import parallel_parse, record_chunks
+
+Literal = namedtuple('Literal', ['value'])
+"""Minimal stand-in for rdflib's Literal used by the scan engine."""
+
+ESCAPE_REGEX = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+ESCAPES = {
+    't': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f',
+    '"': '"', "'": "'", '\\': '\\',
+}
+
+
+def _unescape(match):
+    """Return the character an N-Triples escape sequence stands for."""
+    code = match.group(1) or match.group(2)
+    if code:
+        return chr(int(code, 16))
+    return ESCAPES.get(match.group(3), match.group(0))
+
+
+def decode_literal(raw):
+    """Return str value of a raw (bytes) N-Triples literal content."""
+    value = raw.decode('utf-8')
+    if '\\' in value:
+        value = ESCAPE_REGEX.sub(_unescape, value)
+    return value
+
 
 class FAST(object):
     """FAST term extractor.
@@ -32,6 +62,12 @@ class FAST(object):
 
     IDENTIFIER_REGEX = r'fast/(\d+)'
 
+    ENGINES = ('rdflib', 'scan')
+
+    # Only lines with these predicates matter to `triple`
+    PREF_LABEL = '<{}>'.format(SKOS.prefLabel).encode()
+    IS_REPLACED_BY = '<{}>'.format(DCTERMS.isReplacedBy).encode()
+
     def __init__(self, terms=None):
         """Create instance.
 
@@ -41,25 +77,121 @@ class FAST(object):
         self.skip_identifier = None
 
     @classmethod
-    def load(cls, filepath):
-        """Return array of FAST dict. Main method."""
+    def _open(cls, filepath):
+        """Return binary file object of the .nt file at `filepath`.
+
+        `filepath` can be a zip archive containing the .nt file.
+        """
         if zipfile.is_zipfile(filepath):
             with ZipFile(filepath) as zf:
                 nt_filename = next(
                     (n for n in zf.namelist() if n.endswith('.nt'))
                 )
                 # defaults to equivalent of 'rb'
-                nt_file = zf.open(nt_filename)
+                return zf.open(nt_filename)
         else:
-            nt_file = open(filepath, 'rb')
+            return open(filepath, 'rb')
+
+    @classmethod
+    def load(cls, filepath, engine='rdflib'):
+        """Return array of FAST dict. Main method.
+
+        :param engine: 'rdflib' parses every triple with rdflib's generic
+                       N-Triples parser. 'scan' only decodes the lines
+                       `triple` cares about (see `FAST.scan`).
+        """
+        if engine not in cls.ENGINES:
+            raise ValueError('Unknown engine: {}'.format(engine))
 
+        if engine == 'scan':
+            return list(cls.stream(filepath))
+
+        with cls._open(filepath) as nt_file:
+            return cls._rdflib_parse(nt_file)
+
+    @classmethod
+    def _rdflib_parse(cls, nt_file):
+        """Return array of FAST dict parsed by rdflib from `nt_file`."""
         instance = cls()
         parser = NTriplesParser(instance)
         parser.parse(nt_file)
+        return instance.terms
 
-        nt_file.close()
+    @classmethod
+    def stream(cls, filepath, engine='scan', workers=1):
+        """Generate FAST dict from file at `filepath`.
 
-        return instance.terms
+        :param workers: number of processes parsing the file. Terms are
+                        generated in file order either way.
+        """
+        if workers > 1:
+            with cls._open(filepath) as nt_file:
+                yield from parallel_parse(
+                    partial(cls.parse_chunk, engine=engine),
+                    record_chunks(nt_file, cls.is_record_boundary),
+                    workers
+                )
+        elif engine == 'scan':
+            with cls._open(filepath) as nt_file:
+                yield from cls.scan(nt_file)
+        else:
+            yield from cls.load(filepath, engine=engine)
+
+    @staticmethod
+    def is_record_boundary(previous_line, line):
+        """Return True if a new record can start at (bytes) `line`.
+
+        FAST N-triples are grouped by identifier (subject), so a record
+        starts whenever the subject changes. Keeping groups whole keeps the
+        obsolete-term filtering of `triple` correct within each chunk.
+        """
+        subject = line[:line.find(b'>') + 1]
+        return not previous_line.startswith(subject)
+
+    @classmethod
+    def parse_chunk(cls, chunk, engine='scan'):
+        """Return array of FAST dict from a chunk (bytes) of whole records."""
+        if engine == 'scan':
+            return list(cls.scan(chunk.splitlines()))
+        return cls._rdflib_parse(BytesIO(chunk))
+
+    @classmethod
+    def scan(cls, lines):
+        """Generate FAST dict from an iterable of N-Triples (bytes) lines.
+
+        Specialized alternative to NTriplesParser: lines are pre-filtered by
+        predicate IRI and only the subject IRI and the literal of matching
+        lines are decoded. The triples are then fed to `triple`, so the
+        output is the same as `load`'s.
+
+        Terms are yielded once the following term is found, because an
+        obsoleted term is only known to be so after its prefLabel was read.
+        """
+        instance = cls()
+        pref_label = cls.PREF_LABEL
+        is_replaced_by = cls.IS_REPLACED_BY
+
+        for line in lines:
+            if pref_label in line:
+                predicate = SKOS.prefLabel
+                obj = Literal(
+                    decode_literal(
+                        line[line.index(b'"') + 1:line.rindex(b'"')]
+                    )
+                )
+            elif is_replaced_by in line:
+                predicate = DCTERMS.isReplacedBy
+                obj = None
+            else:
+                continue
+
+            subject = line[1:line.index(b'>')].decode('utf-8')
+            instance.triple(subject, predicate, obj)
+
+            if len(instance.terms) > 1:
+                yield instance.terms.pop(0)
+
+        yield from instance.terms
 
     def triple(self, subject, predicate, obj):
         """Callback interface for NTriplesParser.
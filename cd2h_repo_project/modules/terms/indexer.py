@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Terms bulk indexing."""
+
+import json
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from os.path import dirname, join, realpath
+
+from elasticsearch.exceptions import NotFoundError
+from elasticsearch.helpers import parallel_bulk, scan, streaming_bulk
+
+from .loaders import ALIAS, DOC_TYPE, INDEX
+
+MAPPING_FILE = join(
+    dirname(realpath(__file__)), 'mappings', 'v6', 'terms', 'term-v1.0.0.json'
+)
+
+CHUNK_SIZE = 500
+"""Default number of documents per bulk request."""
+MAX_CHUNK_BYTES = 100 * 1024 * 1024  # 100 MiB
+"""Default maximum size of a bulk request."""
+
+
+def bulk_results(es, actions, chunk_size=CHUNK_SIZE,
+                 max_chunk_bytes=MAX_CHUNK_BYTES, threads=1):
+    """Generate an `(ok, item)` result per action sent to Elasticsearch.
+
+    `actions` is consumed lazily and failures are generated like successes
+    instead of being raised or accumulated.
+
+    :param threads: number of concurrent bulk requests. With more than one
+                    thread, `parallel_bulk` is used.
+    """
+    options = {
+        'chunk_size': chunk_size,
+        'max_chunk_bytes': max_chunk_bytes,
+        'raise_on_error': False,
+        'raise_on_exception': False,
+    }
+
+    if threads > 1:
+        return parallel_bulk(es, actions, thread_count=threads, **options)
+    else:
+        return streaming_bulk(es, actions, **options)
+
+
+def live_fingerprints(es, source, index=INDEX):
+    """Return dict of `_id` to fingerprint of `source` terms in `index`."""
+    hits = scan(
+        es,
+        index=index,
+        query={
+            'query': {'term': {'source': source}},
+            '_source': ['fingerprint'],
+        },
+        size=5000,
+    )
+    return {
+        hit['_id']: hit['_source'].get('fingerprint') for hit in hits
+    }
+
+
+def incremental_actions(es, indexables, source, index=INDEX, changes=None):
+    """Generate the bulk actions turning live `source` terms into `indexables`.
+
+    Only terms that are new or whose fingerprint changed are (re-)indexed.
+    Live terms of `source` that are not in `indexables` anymore (e.g.
+    obsoleted or removed terms) are deleted once `indexables` is exhausted.
+
+    :param indexables: iterable of fingerprinted indexable terms.
+    :param changes: optional Counter of 'create', 'update', 'delete' and
+                    'unchanged' operations.
+    """
+    changes = changes if changes is not None else Counter()
+    live = live_fingerprints(es, source, index)
+
+    for indexable in indexables:
+        _id = str(indexable['_id'])
+
+        if _id not in live:
+            changes['create'] += 1
+        elif live.pop(_id) != indexable['fingerprint']:
+            changes['update'] += 1
+        else:
+            changes['unchanged'] += 1
+            continue
+
+        yield indexable
+
+    for _id in live:
+        changes['delete'] += 1
+        yield {
+            '_op_type': 'delete',
+            '_index': index,
+            '_type': DOC_TYPE,
+            '_id': _id,
+        }
+
+
+BULK_LOAD_SETTINGS = {
+    'index.refresh_interval': '-1',
+    'index.number_of_replicas': 0,
+}
+"""Index settings while bulk loading."""
+ASYNC_TRANSLOG_SETTINGS = {
+    'index.translog.durability': 'async',
+}
+"""Index settings while bulk loading without translog fsync per request."""
+
+
+@contextmanager
+def bulk_load_mode(es, index, enabled=True, async_translog=False):
+    """Context in which `index` is tuned for bulk loading.
+
+    Refreshes and replication are suspended (and optionally translog fsyncs)
+    while in the context. On exit, the original settings are restored, even
+    if loading failed, and the index is refreshed once. If loading
+    succeeded, the index is also force-merged into a single segment which
+    makes completion suggestions faster.
+
+    :param index: index or alias name.
+    :param enabled: if False, only the final refresh happens.
+    :param async_translog: if True, the translog is not fsynced per request.
+    """
+    if not enabled:
+        yield
+        es.indices.refresh(index=index)
+        return
+
+    settings = dict(BULK_LOAD_SETTINGS)
+    if async_translog:
+        settings.update(ASYNC_TRANSLOG_SETTINGS)
+
+    current_settings = es.indices.get_settings(
+        index=index, name=','.join(settings), flat_settings=True
+    )
+    # Unset settings are restored to None i.e. to their default
+    original_settings = {
+        concrete_index: {
+            key: body['settings'].get(key) for key in settings
+        }
+        for concrete_index, body in current_settings.items()
+    }
+
+    es.indices.put_settings(index=index, body=settings)
+    try:
+        yield
+    finally:
+        for concrete_index, body in original_settings.items():
+            es.indices.put_settings(index=concrete_index, body=body)
+
+        es.indices.refresh(index=index)
+
+    es.indices.forcemerge(index=index, max_num_segments=1)
+    es.indices.refresh(index=index)
+
+
+def new_index_name():
+    """Return a fresh, timestamped, concrete terms index name."""
+    return '{index}-{timestamp}'.format(
+        index=INDEX, timestamp=datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+    )
+
+
+def create_index(es, name):
+    """Create concrete terms index `name` with the terms mapping."""
+    with open(MAPPING_FILE) as f:
+        body = json.load(f)
+    es.indices.create(index=name, body=body)
+
+
+def aliased_indices(es, alias=ALIAS):
+    """Return sorted list of the concrete indices behind `alias`."""
+    try:
+        return sorted(es.indices.get_alias(name=alias))
+    except NotFoundError:
+        return []
+
+
+def count_by_source(es, index):
+    """Return dict of number of documents per source in `index`."""
+    result = es.search(
+        index=index,
+        body={
+            'size': 0,
+            'aggs': {'sources': {'terms': {'field': 'source'}}}
+        }
+    )
+    return {
+        bucket['key']: bucket['doc_count']
+        for bucket in result['aggregations']['sources']['buckets']
+    }
+
+
+def swap_aliases(es, new_index):
+    """Atomically point the terms aliases to `new_index`.
+
+    Both `ALIAS` (read by the suggester) and, when it is not a concrete
+    index, `INDEX` (written to by the loaders) are moved. Return the
+    list of indices `ALIAS` pointed to before.
+    """
+    old_indices = aliased_indices(es, ALIAS)
+    actions = [
+        {'remove': {'index': old_index, 'alias': ALIAS}}
+        for old_index in old_indices
+    ]
+    actions.append({'add': {'index': new_index, 'alias': ALIAS}})
+
+    index_is_alias = bool(aliased_indices(es, INDEX))
+    if index_is_alias or not es.indices.exists(index=INDEX):
+        actions.extend(
+            {'remove': {'index': old_index, 'alias': INDEX}}
+            for old_index in aliased_indices(es, INDEX)
+        )
+        actions.append({'add': {'index': new_index, 'alias': INDEX}})
+
+    es.indices.update_aliases(body={'actions': actions})
+
+    return old_indices
+
+
+def delete_indices(es, indices, new_index):
+    """Delete old `indices` and alias `INDEX` to `new_index` if it can be.
+
+    `INDEX` can only become an alias once the original concrete index
+    of the same name is deleted.
+    """
+    for old_index in indices:
+        es.indices.delete(index=old_index, ignore=[404])
+
+    if not es.indices.exists(index=INDEX):
+        es.indices.put_alias(index=new_index, name=INDEX)
+
+
+def stamp_vocabulary_version(es, index=INDEX):
+    """Record a new vocabulary version in the mapping `_meta` of `index`.
+
+    :returns: the new version.
+    """
+    version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+    es.indices.put_mapping(
+        index=index, doc_type=DOC_TYPE,
+        body={'_meta': {'vocabulary_version': version}}
+    )
+    return version
+
+
+def vocabulary_version(es, alias=ALIAS):
+    """Return version of the vocabulary served through `alias`.
+
+    It changes when `alias` points to new indices and when terms are loaded
+    (see `stamp_vocabulary_version`).
+    """
+    try:
+        mappings = es.indices.get_mapping(index=alias, doc_type=DOC_TYPE)
+    except NotFoundError:
+        return ''
+
+    return mappings_version(mappings)
+
+
+def mappings_version(mappings):
+    """Return vocabulary version of the get mapping response `mappings`."""
+    return ','.join(
+        '{index}:{version}'.format(
+            index=index,
+            version=(
+                mapping['mappings'][DOC_TYPE].get('_meta', {})
+                .get('vocabulary_version', '')
+            )
+        )
+        for index, mapping in sorted(mappings.items())
+    )
@@ -6,19 +6,29 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Terms loaders."""
+import hashlib
+import json
 import re
 
+ALIAS = 'terms'
 INDEX = 'terms-term-v1.0.0'
 DOC_TYPE = 'term-v1.0.0'
 
 
 def mesh_indexable(mesh_topic, index=INDEX, doc_type=DOC_TYPE):
-    """Return an ES indexable dict from MeSH dict."""
+    """Return an ES indexable dict from MeSH dict.
+
+    Entry terms are suggestion inputs too, so that suggestions for a
+    synonym (e.g. "Cancer") resolve to the heading (e.g. "Neoplasms").
+    """
     mesh_term = mesh_topic['MH']
 
     suggest = [mesh_term]
     if ' ' in mesh_term:
         suggest.extend(mt.strip('.,') for mt in mesh_term.split())
+    suggest.extend(
+        entry for entry in mesh_topic.get('ENTRY', []) if entry not in suggest
+    )
 
     indexable_topic = {
         '_index': index,
@@ -28,6 +38,8 @@ def mesh_indexable(mesh_topic, index=INDEX, doc_type=DOC_TYPE):
         'value': mesh_term,
         'suggest': suggest
     }
+    if mesh_topic.get('MN'):
+        indexable_topic['tree_numbers'] = mesh_topic['MN']
 
     return indexable_topic
 
@@ -76,3 +88,24 @@ def fast_indexable(topic, index=INDEX, doc_type=DOC_TYPE):
     }
 
     return indexable_topic
+
+
+def fingerprint(indexable):
+    """Return content fingerprint of an indexable term.
+
+    It covers the identifier and every field produced by the *_indexable
+    functions, so any change to what would be indexed changes it.
+    """
+    content = {
+        key: value for key, value in indexable.items()
+        if not key.startswith('_') and key != 'fingerprint'
+    }
+    content['_id'] = str(indexable['_id'])
+    serialized = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+
+def with_fingerprint(indexable):
+    """Return `indexable` with its fingerprint added."""
+    indexable['fingerprint'] = fingerprint(indexable)
+    return indexable
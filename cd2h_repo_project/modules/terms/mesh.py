@@ -1,22 +1,8 @@
 """MeSH term loader."""
 import re
+from functools import partial
 
-
-class RetainedMatch(object):
-    """Retained Match. More convenient API around matching."""
-
-    _prev_match = None  # act as short lived memento pattern
-
-    @classmethod
-    def match(cls, pattern, text):
-        """Return re.match but save result until next `match` call."""
-        cls._prev_match = re.match(pattern, text)
-        return cls._prev_match
-
-    @classmethod
-    def group(cls, index):
-        """Return matched group from saved match."""
-        return cls._prev_match.group(index) if cls._prev_match else None
+from .parallel import parallel_parse, record_chunks
 
 
 class MeSH(object):
@@ -30,29 +16,92 @@ class MeSH(object):
         'geographics': '4'
     }
 
+    # Compiled once: the descriptor file has millions of lines
+    FIELD_REGEX = re.compile(r'(MH|DC|UI|MN|ENTRY|PRINT ENTRY) = (.+)')
+
+    # Repeated fields, collected in a list under their key
+    LIST_FIELDS = {'MN': 'MN', 'ENTRY': 'ENTRY', 'PRINT ENTRY': 'ENTRY'}
+
     @classmethod
-    def _pattern(cls, key):
-        return r'{} = (.+)'.format(key)
+    def _filter_regex(cls, filter):
+        """Return compiled regex matching the DC values kept by `filter`."""
+        return re.compile(r'(?:{})$'.format(cls.filter_to_dc[filter]))
 
     @classmethod
-    def load(cls, filepath, filter='all'):
-        """Return array of MeSH dict. Main method."""
-        terms = []
+    def parse(cls, lines, filter='all'):
+        """Generate MeSH dicts from an iterable of descriptor lines.
+
+        MeSH dicts have the heading (MH), category (DC) and identifier (UI)
+        of a descriptor and, if any, its tree numbers (MN) and entry terms
+        (ENTRY, from ENTRY and PRINT ENTRY) in lists.
+
+        Only one record is held in memory at a time. A record is complete
+        once its `UI = ` line is read.
+        """
+        filter_regex = cls._filter_regex(filter)
+        match_field = cls.FIELD_REGEX.match
+        list_fields = cls.LIST_FIELDS
+        term = {}
 
-        with open(filepath, 'r') as f:
-            term = {}
+        for line in lines:
+            match = match_field(line)
+            if not match:
+                continue
 
-            for l in f.readlines():
-                if RetainedMatch.match(MeSH._pattern('MH'), l):
-                    term['MH'] = RetainedMatch.group(1).strip()
-                elif RetainedMatch.match(MeSH._pattern('DC'), l):
-                    term['DC'] = RetainedMatch.group(1).strip()
-                elif RetainedMatch.match(MeSH._pattern('UI'), l):
-                    term['UI'] = RetainedMatch.group(1).strip()
+            key, value = match.groups()
+            value = value.strip()
 
-                    if re.match(term['DC'], MeSH.filter_to_dc[filter]):
-                        terms.append(term)
+            if key in list_fields:
+                key = list_fields[key]
+                if key == 'ENTRY':
+                    # Entry terms are followed by |-separated attributes
+                    value = value.split('|', 1)[0]
+                values = term.setdefault(key, [])
+                if value not in values:
+                    values.append(value)
+                continue
 
-                    term = {}
+            term[key] = value
 
-        return terms
+            if key == 'UI':
+                if filter_regex.match(term.get('DC', '')):
+                    yield term
+                term = {}
+
+    @staticmethod
+    def is_record_boundary(previous_line, line):
+        """Return True if a new record can start at (bytes) `line`.
+
+        Records end with their `UI = ` line.
+        """
+        return previous_line.startswith(b'UI = ')
+
+    @classmethod
+    def parse_chunk(cls, chunk, filter='all'):
+        """Return list of MeSH dicts from a chunk (bytes) of whole records."""
+        return list(cls.parse(chunk.decode('utf-8').splitlines(), filter))
+
+    @classmethod
+    def stream(cls, filepath, filter='all', workers=1):
+        """Generate MeSH dicts from file at `filepath`.
+
+        Memory usage is constant regardless of the size of the file.
+
+        :param workers: number of processes parsing the file. Terms are
+                        generated in file order either way.
+        """
+        if workers > 1:
+            with open(filepath, 'rb') as f:
+                yield from parallel_parse(
+                    partial(cls.parse_chunk, filter=filter),
+                    record_chunks(f, cls.is_record_boundary),
+                    workers
+                )
+        else:
+            with open(filepath, 'r') as f:
+                yield from cls.parse(f, filter=filter)
+
+    @classmethod
+    def load(cls, filepath, filter='all'):
+        """Return array of MeSH dict. Main method."""
+        return list(cls.stream(filepath, filter=filter))
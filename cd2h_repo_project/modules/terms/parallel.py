@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Multi-process parsing of vocabulary sources.
+
+A source is cut into chunks of bytes aligned on record boundaries. Chunks are
+parsed by a process pool and the parsed terms are yielded back in source
+order.
+"""
+
+from collections import deque
+from multiprocessing import Pool
+
+CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB
+
+
+def _last_line(block):
+    """Return the last line of `block` (bytes ending with a newline)."""
+    return block[block.rfind(b'\n', 0, len(block) - 1) + 1:]
+
+
+def record_chunks(f, is_boundary, chunk_size=CHUNK_SIZE):
+    """Generate chunks of roughly `chunk_size` bytes from binary file `f`.
+
+    A chunk is only cut where `is_boundary(previous_line, line)` is True, so
+    that no record straddles two chunks. The whole file is never held in
+    memory.
+    """
+    carry = b''
+
+    while True:
+        data = f.read(chunk_size)
+        if not data and not carry:
+            return
+
+        parts = [carry, data, f.readline()]
+        previous_line = _last_line(b''.join(parts[-2:]))
+        carry = b''
+
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if is_boundary(previous_line, line):
+                carry = line
+                break
+            parts.append(line)
+            previous_line = line
+
+        yield b''.join(parts)
+
+
+def parallel_parse(parse_chunk, chunks, workers):
+    """Generate terms parsed from `chunks` by `workers` processes.
+
+    Results are merged in the order of `chunks`. Only a bounded number of
+    chunks are in flight at a time, so memory usage does not depend on the
+    size of the source.
+
+    :param parse_chunk: picklable callable returning a list of terms from a
+                        chunk.
+    """
+    max_pending = 2 * workers
+    pending = deque()
+
+    with Pool(workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.apply_async(parse_chunk, (chunk,)))
+
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+
+        while pending:
+            yield from pending.popleft().get()
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Local prefix index of terms.
+
+An alternative to the Elasticsearch completion suggester: the `suggest`
+inputs of all terms are normalized like the `standard` analyzer does and
+kept in a sorted array. Suggestions for a prefix are a binary search away.
+
+The index is a single file that is memory-mapped, so that forked workers
+share its pages. File format (unsigned integers are little-endian 32-bit):
+
+    MAGIC | number of keys | number of docs | length of sources
+    | sources (JSON list)
+    | key offsets (keys + 1) | key docs (keys) | key sources (keys bytes)
+    | doc offsets (docs + 1) | keys blob | docs blob (JSON)
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+from bisect import bisect_left
+
+from elasticsearch.helpers import scan
+
+from .loaders import ALIAS
+
+MAGIC = b'MENRVA-TERMS-PREFIX-INDEX\n'
+HEADER = struct.Struct('<III')
+UINT = struct.Struct('<I')
+
+WORD_REGEX = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Return `text` lowercased with words separated by a single space."""
+    return ' '.join(WORD_REGEX.findall(text.lower()))
+
+
+def _suggest_inputs(suggest):
+    """Return list of inputs of a `suggest` field value."""
+    if isinstance(suggest, dict):
+        suggest = suggest.get('input', [])
+    if isinstance(suggest, str):
+        suggest = [suggest]
+    return suggest
+
+
+def build(path, terms):
+    """Write prefix index of `terms` to `path`.
+
+    :param terms: iterable of dicts with `_id`, `source`, `value` and
+                  `suggest` keys (see `loaders`).
+    """
+    terms = sorted(terms, key=lambda t: (t['value'], t['source']))
+    sources = sorted({t['source'] for t in terms})
+    source_ordinals = {source: i for i, source in enumerate(sources)}
+
+    docs = []
+    entries = set()
+    for ordinal, term in enumerate(terms):
+        docs.append(json.dumps(
+            {
+                '_id': str(term['_id']),
+                '_source': {'source': term['source'], 'value': term['value']}
+            },
+            ensure_ascii=False
+        ).encode('utf-8'))
+        for suggest_input in _suggest_inputs(term['suggest']):
+            key = normalize(suggest_input).encode('utf-8')
+            if key:
+                entries.add((key, ordinal, source_ordinals[term['source']]))
+    entries = sorted(entries)
+
+    serialized_sources = json.dumps(sources).encode('utf-8')
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(
+                len(entries), len(docs), len(serialized_sources)
+            ))
+            f.write(serialized_sources)
+
+            offset = 0
+            for key, _, _ in entries:
+                f.write(UINT.pack(offset))
+                offset += len(key)
+            f.write(UINT.pack(offset))
+            for _, ordinal, _ in entries:
+                f.write(UINT.pack(ordinal))
+            f.write(bytes(source for _, _, source in entries))
+
+            offset = 0
+            for doc in docs:
+                f.write(UINT.pack(offset))
+                offset += len(doc)
+            f.write(UINT.pack(offset))
+
+            for key, _, _ in entries:
+                f.write(key)
+            for doc in docs:
+                f.write(doc)
+
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def es_terms(es, index=ALIAS):
+    """Generate terms of `index` in the form expected by `build`."""
+    hits = scan(
+        es, index=index, _source=['source', 'value', 'suggest'],
+        query={'query': {'match_all': {}}}
+    )
+    for hit in hits:
+        term = dict(hit['_source'])
+        term['_id'] = hit['_id']
+        yield term
+
+
+class _Keys(object):
+    """Sequence view of the sorted keys, for `bisect`."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return self.index.number_of_keys
+
+    def __getitem__(self, i):
+        return self.index.key(i)
+
+
+class PrefixIndex(object):
+    """Read-only, memory-mapped prefix index."""
+
+    def __init__(self, path):
+        """Constructor."""
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a terms prefix index.'.format(path))
+
+        offset = len(MAGIC)
+        self.number_of_keys, self.number_of_docs, sources_length = (
+            HEADER.unpack_from(self._mm, offset)
+        )
+        offset += HEADER.size
+        self.sources = json.loads(
+            self._mm[offset:offset + sources_length].decode('utf-8')
+        )
+        offset += sources_length
+
+        self._key_offsets = offset
+        offset += (self.number_of_keys + 1) * UINT.size
+        self._key_docs = offset
+        offset += self.number_of_keys * UINT.size
+        self._key_sources = offset
+        offset += self.number_of_keys
+        self._doc_offsets = offset
+        offset += (self.number_of_docs + 1) * UINT.size
+        self._keys = offset
+        self._docs = offset + self._uint(
+            self._key_offsets, self.number_of_keys
+        )
+        self._sorted_keys = _Keys(self)
+
+    def _uint(self, section, i):
+        return UINT.unpack_from(self._mm, section + i * UINT.size)[0]
+
+    def key(self, i):
+        """Return the bytes of the i-th key."""
+        start = self._uint(self._key_offsets, i)
+        end = self._uint(self._key_offsets, i + 1)
+        return self._mm[self._keys + start:self._keys + end]
+
+    def doc(self, ordinal):
+        """Return document dict (`_id` and `_source`) of `ordinal`."""
+        start = self._uint(self._doc_offsets, ordinal)
+        end = self._uint(self._doc_offsets, ordinal + 1)
+        return json.loads(
+            self._mm[self._docs + start:self._docs + end].decode('utf-8')
+        )
+
+    def suggest(self, query, source=None, limit=5):
+        """Return list of documents with an input starting with `query`.
+
+        Like the completion suggester, a document is suggested once and
+        documents are ordered by their best matching input. Unlike it,
+        usage weights (see `tasks.update_term_usage`) are not considered.
+
+        :param source: only suggest documents of this source if not None.
+        """
+        if source is not None and source not in self.sources:
+            return []
+        source_ordinal = self.sources.index(source) if source else None
+
+        prefix = normalize(query).encode('utf-8')
+        i = bisect_left(self._sorted_keys, prefix)
+        ordinals = []
+
+        while i < self.number_of_keys and len(ordinals) < limit:
+            if not self.key(i).startswith(prefix):
+                break
+            ordinal = self._uint(self._key_docs, i)
+            if ((source_ordinal is None or
+                    self._mm[self._key_sources + i] == source_ordinal) and
+                    ordinal not in ordinals):
+                ordinals.append(ordinal)
+            i += 1
+
+        return [self.doc(ordinal) for ordinal in ordinals]
+
+    def close(self):
+        """Unmap the index."""
+        self._mm.close()
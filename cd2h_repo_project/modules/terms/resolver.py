@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Bulk resolution of term identifiers."""
+
+from elasticsearch.exceptions import TransportError
+from flask import current_app
+from invenio_search import current_search_client
+
+from .loaders import ALIAS
+
+
+def search_term_ids(pairs, es, index=ALIAS):
+    """Return dict of (source, value) -> id of the indexed `pairs`.
+
+    All pairs are resolved by a single search. Pairs that are not indexed
+    are absent from the result. Elasticsearch errors percolate.
+
+    :param pairs: iterable of (source, value).
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+
+    body = {
+        'query': {
+            'bool': {
+                'should': [
+                    {
+                        'bool': {
+                            'filter': [
+                                {'term': {'source': source}},
+                                {'term': {'value': value}},
+                            ]
+                        }
+                    }
+                    for source, value in pairs
+                ],
+                'minimum_should_match': 1,
+            }
+        },
+        '_source': ['source', 'value'],
+        # Some values have more than one (deprecated) identifier
+        'size': 2 * len(pairs),
+    }
+    result = es.search(index=index, body=body)
+
+    ids = {}
+    for hit in result['hits']['hits']:
+        key = (hit['_source']['source'], hit['_source']['value'])
+        ids.setdefault(key, hit['_id'])
+    return ids
+
+
+def resolve_term_ids(terms, es=None, index=ALIAS):
+    """Return dict of (source, value) -> id of the indexed `terms`.
+
+    If the terms index is unavailable, an empty dict is returned so that
+    callers can carry on with the terms as is.
+
+    :param terms: iterable of term dicts with `source` and `value` keys.
+    """
+    pairs = [
+        (t['source'], t['value']) for t in terms
+        if t.get('source') and t.get('value')
+    ]
+
+    try:
+        return search_term_ids(pairs, es or current_search_client, index)
+    except TransportError:
+        current_app.logger.exception('Could not resolve term ids.')
+        return {}
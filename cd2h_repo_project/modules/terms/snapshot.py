@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Snapshots of parsed vocabularies.
+
+Parsing a vocabulary source takes minutes, but the source rarely changes.
+The parsed and filtered terms of a source are saved in a compact snapshot
+file keyed by the SHA-256 of the source. As long as the source is unchanged,
+terms are read back from the (memory-mapped) snapshot instead.
+
+Snapshot file format:
+
+    MAGIC | key (32 bytes) | (length (4 bytes) | JSON term)*
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from os.path import basename, dirname, exists, join, realpath
+
+SNAPSHOT_DIR = join(dirname(realpath(__file__)), 'data', 'snapshots')
+"""Default directory of snapshot files."""
+
+VERSION = 2
+"""Bump when the terms produced by the loaders change for a same source."""
+
+MAGIC = b'MENRVA-TERMS-SNAPSHOT\n'
+KEY_SIZE = 32
+LENGTH = struct.Struct('>I')
+
+
+def checksum(filepath, block_size=1024 * 1024):
+    """Return SHA-256 digest (bytes) of file at `filepath`."""
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha256.update(block)
+    return sha256.digest()
+
+
+def _serialized_params(params):
+    """Return canonical bytes of loading `params`."""
+    return json.dumps([VERSION, params], sort_keys=True).encode('utf-8')
+
+
+def snapshot_key(filepath, params):
+    """Return key of the snapshot of `filepath` parsed with `params`."""
+    sha256 = hashlib.sha256(checksum(filepath))
+    sha256.update(_serialized_params(params))
+    return sha256.digest()
+
+
+def snapshot_path(filepath, params, directory=SNAPSHOT_DIR):
+    """Return path of the snapshot file of `filepath` parsed with `params`.
+
+    Different loading parameters of a same source get different files.
+    """
+    params_digest = hashlib.sha256(_serialized_params(params)).hexdigest()
+    return join(
+        directory,
+        '{name}.{params}.snapshot'.format(
+            name=basename(filepath), params=params_digest[:12]
+        )
+    )
+
+
+def read_key(path):
+    """Return key of snapshot file at `path` or None if not a snapshot."""
+    if not exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        return f.read(KEY_SIZE)
+
+
+def read(path):
+    """Generate terms from snapshot file at `path`."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = len(MAGIC) + KEY_SIZE
+        if size <= offset:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while offset < size:
+                (length,) = LENGTH.unpack_from(mm, offset)
+                offset += LENGTH.size
+                yield json.loads(mm[offset:offset + length].decode('utf-8'))
+                offset += length
+
+
+def write(path, key, terms):
+    """Generate `terms` while saving them to snapshot file at `path`.
+
+    The snapshot only replaces `path` once `terms` is exhausted, so an
+    interrupted load never leaves a partial snapshot behind.
+    """
+    os.makedirs(dirname(path), exist_ok=True)
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(key)
+
+            for term in terms:
+                data = json.dumps(term, ensure_ascii=False).encode('utf-8')
+                f.write(LENGTH.pack(len(data)))
+                f.write(data)
+                yield term
+
+        os.replace(tmp_path, path)
+    finally:
+        if exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def cached(filepath, params, load, directory=SNAPSHOT_DIR):
+    """Generate terms of source `filepath` from its snapshot if up to date.
+
+    Otherwise, terms are generated by `load()` and saved to a new snapshot.
+
+    :param params: JSON-serializable loading parameters that change the
+                   generated terms (e.g. a filter).
+    :param load: callable returning an iterable of JSON-serializable terms.
+    """
+    key = snapshot_key(filepath, params)
+    path = snapshot_path(filepath, params, directory)
+
+    if read_key(path) == key:
+        return read(path)
+    else:
+        return write(path, key, load())
@@ -7,10 +7,13 @@
 
 """Term suggestion engine."""
 
-from elasticsearch_dsl import Search
+from elasticsearch_dsl import MultiSearch, Search
+from flask import current_app
 from invenio_search import current_search_client
 
+from cd2h_repo_project.modules.terms.cache import normalize_key
 from cd2h_repo_project.modules.terms.constants import SOURCES
+from cd2h_repo_project.modules.terms.ext import current_terms
 
 
 def to_frontend_dict(es_suggestion):
@@ -18,7 +21,6 @@ def to_frontend_dict(es_suggestion):
 
     The frontend expects 2 fields, 'name' (human readable value) and 'value'
     (machine/backend value).
-    TODO: Use id from es_suggestion
     """
     source = es_suggestion['_source']['source']
     value = es_suggestion['_source']['value']
@@ -28,7 +30,7 @@ def to_frontend_dict(es_suggestion):
         'value': {
             'value': value,
             'source': source,
-            'id': 'FILL ME'
+            'id': es_suggestion['_id']
         }
     }
 
@@ -37,23 +39,193 @@ def suggest_terms(query, source=None, limit=5):
     """Return front-end consumable ES value suggestions from query.
 
     For now, only allow one `source` or None (all sources).
+    Suggestions come from TERMS_SUGGEST_BACKEND. Elasticsearch suggestions
+    are cached if TERMS_SUGGEST_CACHE_ENABLED.
     """
-    result_bucket = 'terms'
-    completion = {
-        "field": "suggest",
-        "size": limit,
-        "contexts": {
-            "source_filter": [s for s in SOURCES if s == source or not source]
-        }
+    return suggest_terms_batch({'terms': (query, source, limit)})['terms']
+
+
+def suggest_terms_batch(queries):
+    """Return front-end consumable suggestions of several queries.
+
+    All queries not in the cache are answered by a single ES request.
+
+    :param queries: dict of name -> (query, source, limit).
+    :returns: dict of name -> suggestions.
+    """
+    if current_app.config['TERMS_SUGGEST_BACKEND'] == 'prefix_index':
+        return prefix_index_terms(current_terms.prefix_index, queries)
+
+    cache = current_terms.suggestion_cache
+    if cache is None:
+        return _coalesced_suggest_terms(queries)
+
+    keys = {name: normalize_key(*query) for name, query in queries.items()}
+    results = {name: cache.get(key) for name, key in keys.items()}
+    misses = {
+        name: queries[name] for name, terms in results.items()
+        if terms is None
+    }
+
+    if misses:
+        for name, terms in _coalesced_suggest_terms(misses).items():
+            cache.set(keys[name], terms)
+            results[name] = terms
+
+    return results
+
+
+def prefix_index_terms(prefix_index, queries):
+    """Return front-end consumable suggestions of queries from `prefix_index`.
+
+    :param queries: dict of name -> (query, source, limit).
+    """
+    return {
+        name: [
+            to_frontend_dict(s)
+            for s in prefix_index.suggest(query, source, limit)
+        ]
+        for name, (query, source, limit) in queries.items()
     }
-    suggester = (
-        Search(using=current_search_client, index='terms')
-        .suggest(result_bucket, query, completion=completion)
+
+
+def _coalesced_suggest_terms(queries):
+    """Return ES value suggestions of queries (see `_suggest_terms`).
+
+    Identical concurrent requests (same normalized queries, whatever their
+    names) wait for the first one's suggestions.
+
+    :param queries: dict of name -> (query, source, limit).
+    """
+    flight = current_terms.suggestion_flight
+    if flight is None or not queries:
+        return _suggest_terms(queries)
+
+    by_key = {normalize_key(*query): query for query in queries.values()}
+    terms = flight.do(
+        'terms:' + '\n'.join(sorted(by_key)),
+        lambda: _suggest_terms(by_key)
     )
 
-    result = suggester.execute()
-    suggestions = result.suggest[result_bucket][0]['options']
+    return {
+        name: terms[normalize_key(*query)] for name, query in queries.items()
+    }
+
+
+def _sources(source):
+    """Return list of sources matching `source` (None for all)."""
+    return [s for s in SOURCES if s == source or not source]
+
+
+def _suggest_terms(queries):
+    """Return ES value suggestions of queries.
 
-    terms = [to_frontend_dict(s) for s in suggestions]
+    Suggestions come from the completion suggester, in one request. Queries
+    with fewer than `limit` completions are topped up with infix matches
+    (see `infix_searches`), in one more request.
+
+    :param queries: dict of name -> (query, source, limit).
+    """
+    if not queries:
+        return {}
+
+    response = completion_search(queries).execute()
+    terms = completion_terms(queries, response.to_dict())
+
+    searches = infix_searches(queries, terms)
+    if searches:
+        multi_search = MultiSearch(using=current_search_client, index='terms')
+        for _, search in searches:
+            multi_search = multi_search.add(search)
+        responses = [r.to_dict() for r in multi_search.execute()]
+        add_infix_terms(terms, searches, responses)
 
     return terms
+
+
+def suggester_names(queries):
+    """Return dict of name -> Elasticsearch suggester name of queries.
+
+    Names of queries come from clients and could clash with the options of
+    the suggest request (e.g. 'text'): suggesters are named q0, q1...
+    """
+    return {name: 'q{}'.format(i) for i, name in enumerate(queries)}
+
+
+def completion_search(queries):
+    """Return Search of the completion suggestions of queries.
+
+    :param queries: dict of name -> (query, source, limit).
+    """
+    search = Search(using=current_search_client, index='terms')
+    suggesters = suggester_names(queries)
+    for name, (query, source, limit) in queries.items():
+        completion = {
+            "field": "suggest",
+            "size": limit,
+            "contexts": {
+                "source_filter": _sources(source)
+            }
+        }
+        search = search.suggest(
+            suggesters[name], query, completion=completion
+        )
+    return search
+
+
+def completion_terms(queries, response):
+    """Return dict of name -> terms of a completion `response` dict."""
+    suggestions = response['suggest']
+    return {
+        name: [
+            to_frontend_dict(s)
+            for s in suggestions[suggester][0]['options']
+        ]
+        for name, suggester in suggester_names(queries).items()
+    }
+
+
+def infix_searches(queries, terms):
+    """Return list of (name, Search) of infix matches of incomplete queries.
+
+    The trigrams of the query must all be among the trigrams indexed in
+    `value.infix`, so a query can match anywhere in a term, even inside a
+    word (e.g. 'cardio' in 'Echocardiography'). Words shorter than 3
+    characters match nothing.
+
+    :param queries: dict of name -> (query, source, limit).
+    :param terms: dict of name -> terms already suggested, to exclude.
+    """
+    searches = []
+    for name, (query, source, limit) in queries.items():
+        suggested_ids = [t['value']['id'] for t in terms[name]]
+        if not query.strip() or len(suggested_ids) >= limit:
+            continue
+
+        search = (
+            Search(index='terms')
+            .query(
+                'match',
+                **{'value.infix': {'query': query, 'operator': 'and'}}
+            )
+            .filter('terms', source=_sources(source))
+            .source(['source', 'value'])
+            .extra(size=limit - len(suggested_ids))
+        )
+        if suggested_ids:
+            search = search.exclude('ids', values=suggested_ids)
+        searches.append((name, search))
+
+    return searches
+
+
+def add_infix_terms(terms, searches, responses):
+    """Extend `terms` with the hits of the infix `searches` responses.
+
+    :param searches: list of (name, Search) (see `infix_searches`).
+    :param responses: list of multi search response dicts, in order.
+    """
+    for (name, _), response in zip(searches, responses):
+        terms[name].extend(
+            to_frontend_dict(hit) for hit in response['hits']['hits']
+        )
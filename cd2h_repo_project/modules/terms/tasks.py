@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of menRva.
+# Copyright (C) 2018-present NU,FSM,GHSL.
+#
+# menRva is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Terms Celery tasks."""
+
+from copy import deepcopy
+
+from celery import shared_task
+from elasticsearch.helpers import scan
+from flask import current_app
+from invenio_search import current_search_client
+
+from cd2h_repo_project.modules.records.api import RecordType
+from cd2h_repo_project.modules.records.search import RecordsSearch
+
+from .constants import SOURCES
+from .indexer import bulk_results, stamp_vocabulary_version
+from .loaders import ALIAS, DOC_TYPE
+from .resolver import search_term_ids
+
+RESOLVE_CHUNK_SIZE = 500
+"""Number of terms resolved per search (below the max boolean clauses)."""
+
+# Loaded terms have a plain list of inputs, weighted terms an object
+UPDATE_USAGE_SCRIPT = (
+    "def inputs = ctx._source.suggest;"
+    "if (inputs instanceof Map) { inputs = inputs.input; }"
+    "ctx._source.suggest = ['input': inputs, 'weight': params.usage];"
+    "ctx._source.usage = params.usage;"
+)
+
+
+def record_usage(max_terms):
+    """Return dict of (source, value) -> number of published records.
+
+    The nested `subjects` aggregation of the records facets is reused with
+    room for `max_terms` values per source.
+    """
+    subjects = deepcopy(
+        current_app.config['RECORDS_REST_FACETS']['records']['aggs'][
+            'subjects'
+        ]
+    )
+    source_agg = subjects['aggs']['source']
+    source_agg['terms']['size'] = len(SOURCES)
+    source_agg['aggs']['subject']['terms']['size'] = max_terms
+
+    search = (
+        RecordsSearch()
+        .filter('term', type=RecordType.published.value)
+        .extra(size=0)
+        .update_from_dict({'aggs': {'subjects': subjects}})
+    )
+    aggregations = search.execute().aggregations.to_dict()
+
+    return {
+        (source['key'], subject['key']): subject['record_count']['doc_count']
+        for source in aggregations['subjects']['source']['buckets']
+        for subject in source['subject']['buckets']
+    }
+
+
+def live_usage(es, index=ALIAS):
+    """Return dict of id -> usage of the terms of `index` in use."""
+    hits = scan(
+        es, index=index, _source=['usage'],
+        query={'query': {'range': {'usage': {'gt': 0}}}}
+    )
+    return {hit['_id']: hit['_source']['usage'] for hit in hits}
+
+
+def usage_actions(usage, live, index=ALIAS):
+    """Generate update actions of the terms whose usage changed.
+
+    :param usage: dict of id -> current usage.
+    :param live: dict of id -> indexed usage.
+    """
+    changed = {
+        term_id: count for term_id, count in usage.items()
+        if live.get(term_id, 0) != count
+    }
+    changed.update({
+        term_id: 0 for term_id in live if term_id not in usage
+    })
+
+    for term_id, count in changed.items():
+        yield {
+            '_op_type': 'update',
+            '_index': index,
+            '_type': DOC_TYPE,
+            '_id': term_id,
+            'script': {
+                'lang': 'painless',
+                'source': UPDATE_USAGE_SCRIPT,
+                'params': {'usage': count},
+            },
+        }
+
+
+@shared_task(ignore_result=True)
+def update_term_usage():
+    """Weight term suggestions by their usage in published records.
+
+    Only terms whose usage changed are updated.
+
+    :returns: number of updated terms.
+    """
+    es = current_search_client
+    record_counts = record_usage(current_app.config['TERMS_USAGE_MAX_TERMS'])
+
+    pairs = list(record_counts)
+    usage = {}
+    for i in range(0, len(pairs), RESOLVE_CHUNK_SIZE):
+        ids = search_term_ids(pairs[i:i + RESOLVE_CHUNK_SIZE], es)
+        for pair, term_id in ids.items():
+            usage[term_id] = record_counts[pair]
+
+    updated = 0
+    for ok, item in bulk_results(es, usage_actions(usage, live_usage(es))):
+        if ok:
+            updated += 1
+        else:
+            current_app.logger.error(
+                'Could not update term usage: {}'.format(item)
+            )
+
+    if updated:
+        es.indices.refresh(index=ALIAS)
+        stamp_vocabulary_version(es, ALIAS)
+
+    return updated
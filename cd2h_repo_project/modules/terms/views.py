@@ -7,11 +7,15 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Terms views."""
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, abort, current_app, jsonify, request
 from flask_security import login_required
+from invenio_access.permissions import Permission
+from invenio_admin.permissions import action_admin_access
 
+from .cache import suggestion_etag
 from .constants import FAST_SOURCE, MESH_SOURCE, SOURCES
-from .suggester import suggest_terms
+from .ext import current_terms
+from .suggester import suggest_terms, suggest_terms_batch
 
 blueprint = Blueprint(
     'menrva_terms',
@@ -19,20 +23,39 @@ blueprint = Blueprint(
     url_prefix='/terms',
 )
 
+MAX_LIMIT = 20
+"""Maximum number of suggestions of a query."""
+
+
+def suggestion_limit(limit):
+    """Return number of suggestions asked for: 5 if None, at most MAX_LIMIT."""
+    return min(limit or 5, MAX_LIMIT)
+
 
 def suggest(source=None):
-    """Return term suggestions."""
+    """Return term suggestions.
+
+    Suggestions only change with the vocabulary, so they are validated by
+    an ETag of the vocabulary version and conditional requests get a 304
+    without any lookup.
+    """
     q = request.args.get('q', '')
-    limit = request.args.get('limit', type=int)
+    limit = suggestion_limit(request.args.get('limit', type=int))
 
-    if limit:
-        terms = suggest_terms(q, source=source, limit=limit)
+    etag = suggestion_etag(current_terms.vocabulary_version, q, source, limit)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
     else:
-        terms = suggest_terms(q, source=source)
+        terms = suggest_terms(q, source=source, limit=limit)
+        response = jsonify({'terms': terms})
 
-    response = {'terms': terms}
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config[
+        'TERMS_SUGGEST_MAX_AGE'
+    ]
 
-    return jsonify(response)
+    return response
 
 
 @blueprint.route('/_suggest', methods=['GET'])
@@ -42,6 +65,49 @@ def all_suggest():
     return suggest()
 
 
+MAX_BATCH_SIZE = 20
+
+
+def batch_query(query):
+    """Return (q, source, limit) of a batched `query` dict or abort."""
+    if not isinstance(query, dict):
+        abort(400)
+
+    q = query.get('q', '')
+    source = query.get('source')
+    limit = query.get('limit', 5)
+
+    valid = (
+        isinstance(q, str) and
+        (source is None or source in SOURCES) and
+        isinstance(limit, int) and 0 < limit
+    )
+    if not valid:
+        abort(400)
+
+    return q, source, suggestion_limit(limit)
+
+
+@blueprint.route('/_suggest', methods=['POST'])
+@login_required
+def batch_suggest():
+    """Suggest keywords for several queries at once.
+
+    Expects a JSON object of name -> {"q": ..., "source": ..., "limit": ...}
+    ("source" and "limit" are optional) and returns the suggestions keyed by
+    the same names. Limits are capped at MAX_LIMIT.
+    """
+    queries = request.get_json(silent=True)
+    if not isinstance(queries, dict) or len(queries) > MAX_BATCH_SIZE:
+        abort(400)
+
+    terms = suggest_terms_batch(
+        {name: batch_query(query) for name, query in queries.items()}
+    )
+
+    return jsonify({'terms': terms})
+
+
 @blueprint.route('/mesh/_suggest', methods=['GET'])
 @login_required
 def mesh_suggest():
@@ -56,6 +122,24 @@ def fast_suggest():
     return suggest(FAST_SOURCE)
 
 
+@blueprint.route('/_suggest/stats', methods=['GET'])
+@login_required
+def suggest_stats():
+    """Return suggestion cache and coalescing statistics of this process.
+
+    Admins only.
+    """
+    if not Permission(action_admin_access).can():
+        abort(403)
+
+    cache = current_terms.suggestion_cache
+    flight = current_terms.suggestion_flight
+    return jsonify({
+        'cache': cache.stats() if cache else None,
+        'single_flight': flight.stats() if flight else None,
+    })
+
+
 @blueprint.app_template_filter('serialize_terms_for_edit_ui')
 def serialize_terms_for_edit_ui(record):
     """Serialize record for edit page usage.
@@ -1,5 +1,14 @@
 """General utility functions for any module."""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from copy import deepcopy
+
+from flask import has_request_context, request
 from flask_principal import AnonymousIdentity, Identity, RoleNeed, UserNeed
+from invenio_access import Permission
 
 
 def get_identity(user):
@@ -19,3 +28,194 @@ def get_identity(user):
 
     identity.user = user
     return identity
+
+
+def _request_cache():
+    """Return dict kept for the current request or None outside requests."""
+    if not has_request_context():
+        return None
+
+    cache = getattr(request, 'menrva_permission_cache', None)
+    if cache is None:
+        cache = {}
+        setattr(request, 'menrva_permission_cache', cache)
+    return cache
+
+
+def get_request_identity(user):
+    """Returns the identity for a given user, built once per request.
+
+    See `get_identity`.
+    """
+    cache = _request_cache()
+    if cache is None:
+        return get_identity(user)
+
+    key = ('identity', getattr(user, 'id', None))
+    if key not in cache:
+        cache[key] = get_identity(user)
+    return cache[key]
+
+
+def is_allowed(need, user):
+    """Returns if `user` is granted `need`, decided once per request.
+
+    Equivalent to `Permission(need).allows(get_identity(user))`, whose grants
+    are queried from the database every time. By default, any Permission
+    has a super-user Need.
+    """
+    cache = _request_cache()
+    if cache is None:
+        return Permission(need).allows(get_identity(user))
+
+    key = ('allows', need, getattr(user, 'id', None))
+    if key not in cache:
+        cache[key] = Permission(need).allows(get_request_identity(user))
+    return cache[key]
+
+
+class _Call(object):
+    """Call in flight."""
+
+    def __init__(self):
+        """Constructor."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight(object):
+    """Coalesce identical concurrent calls.
+
+    While a call is in flight for a key, calls for the same key wait for its
+    result instead of being made again. Results are dropped as soon as the
+    call is done, so a result is never older than the request waiting for
+    it. Waiting calls get their own (deep) copy of the result.
+
+    With a Redis, calls are coalesced across processes too: the process
+    holding the Redis lock of a key makes the call and publishes its result,
+    which must be JSON-serializable, to the others.
+    """
+
+    REDIS_PREFIX = 'menrva:singleflight'
+
+    # Only release a lock that is still ours (it could have expired)
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) end "
+        "return 0"
+    )
+
+    def __init__(self, redis_url=None, timeout=10, poll_interval=0.01):
+        """Constructor.
+
+        :param redis_url: URL of a Redis shared by all processes (optional).
+        :param timeout: seconds to wait for a call in flight before making
+                        the call anyway.
+        :param poll_interval: seconds between checks of a call in flight in
+                              another process.
+        """
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.redis = None
+        if redis_url:
+            from redis import StrictRedis
+            self.redis = StrictRedis.from_url(redis_url)
+            self._release = self.redis.register_script(self.RELEASE_SCRIPT)
+
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, function):
+        """Return `function()`, or the result of the call of `key` in flight.
+
+        Exceptions of the call percolate to all waiting calls.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return function()
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.result)
+
+        try:
+            if self.redis is not None:
+                call.result = self._do_shared(key, function)
+            else:
+                call.result = function()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            call.done.set()
+
+        # Followers copy the result while the leader's caller may modify it
+        return deepcopy(call.result) if followers else call.result
+
+    def _redis_key(self, kind, digest, token=b''):
+        return '{prefix}:{kind}:{digest}:{token}'.format(
+            prefix=self.REDIS_PREFIX, kind=kind, digest=digest,
+            token=token.decode('ascii')
+        )
+
+    def _do_shared(self, key, function):
+        """Return `function()` or the result of another process' call."""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        lock_key = self._redis_key('lock', digest)
+        timeout_ms = int(self.timeout * 1000)
+        deadline = time.time() + self.timeout
+
+        while time.time() < deadline:
+            token = uuid.uuid4().hex.encode('ascii')
+            if self.redis.set(lock_key, token, nx=True, px=timeout_ms):
+                try:
+                    result = function()
+                    self.redis.set(
+                        self._redis_key('result', digest, token),
+                        json.dumps(result), px=timeout_ms
+                    )
+                    return result
+                finally:
+                    self._release(keys=[lock_key], args=[token])
+
+            leader = self.redis.get(lock_key)
+            while leader is not None and time.time() < deadline:
+                time.sleep(self.poll_interval)
+                # The result is published before the lock is released
+                current = self.redis.get(lock_key)
+                data = self.redis.get(
+                    self._redis_key('result', digest, leader)
+                )
+                if data is not None:
+                    return json.loads(data.decode('utf-8'))
+                if current != leader:
+                    break
+
+        return function()
+
+    def stats(self):
+        """Return dict of coalescing statistics (of this process)."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+                'redis': self.redis is not None,
+            }
@@ -21,6 +21,14 @@ with open(os.path.join('cd2h_repo_project', 'version.py'), 'rt') as fp:
     exec(fp.read(), g)
     version = g['__version__']
 
+extras_require = {
+    # Asynchronous term suggestion service (modules.terms.asgi)
+    'asgi': [
+        'elasticsearch-async>=6.2.0,<7.0.0',
+        'uvicorn>=0.3.0',
+    ],
+}
+
 setup(
     name='cd2h-repo-project',
     version=version,
@@ -32,6 +40,7 @@ setup(
     author_email='DL_FSM_GDS@e.northwestern.edu',
     url='https://github.com/galterlibrary/cd2h-repo-project',
     packages=packages,
+    extras_require=extras_require,
     zip_safe=False,
     include_package_data=True,
     platforms='any',
@@ -45,6 +54,7 @@ setup(
         'flask.commands': [
             'locations = cd2h_repo_project.modules.records.cli:locations',
             'terms = cd2h_repo_project.modules.terms.cli:terms',
+            'export = cd2h_repo_project.modules.records.cli:export',
         ],
         'invenio_base.blueprints': [
             'cd2h_repo_project = cd2h_repo_project.views:blueprint',
@@ -57,6 +67,7 @@ setup(
         ],
         'invenio_base.api_blueprints': [
             'menrva_terms = cd2h_repo_project.modules.terms.views:blueprint',
+            'menrva_export = cd2h_repo_project.modules.records.export:blueprint',
         ],
         'invenio_assets.bundles': [
             'cd2hrepo_theme_css = cd2h_repo_project.modules.theme.bundles:css',
@@ -79,17 +90,22 @@ setup(
         'invenio_base.apps': [
             'cd2hrepo_records = cd2h_repo_project.modules.records.ext:Records',
             'cd2hrepo_doi = cd2h_repo_project.modules.doi.ext:DigitalObjectIdentifier',
+            'menrva_terms = cd2h_repo_project.modules.terms.ext:Terms',
         ],
         # Loaded when create_api/create_app is used as application factory
         'invenio_base.api_apps': [
             'cd2hrepo_records = cd2h_repo_project.modules.records.ext:Records',
             'cd2hrepo_doi = cd2h_repo_project.modules.doi.ext:DigitalObjectIdentifier',
+            'menrva_terms = cd2h_repo_project.modules.terms.ext:Terms',
         ],
         'invenio_access.actions': [
           'menrva-view-published-record = cd2h_repo_project.modules.records.permissions:menrva_view_published_record',
           'menrva-edit = cd2h_repo_project.modules.records.permissions:menrva_edit',
           'menrva-edit-published-record = cd2h_repo_project.modules.records.permissions:menrva_edit_published_record',
         ],
+        'invenio_celery.tasks': [
+            'menrva_terms = cd2h_repo_project.modules.terms.tasks',
+        ],
         'invenio_pidstore.minters': [
             'cd2h_recid = cd2h_repo_project.modules.records.minters:mint_pids_for_record',
             'cd2h_depid = cd2h_repo_project.modules.records.minters:mint_pids_for_deposit'
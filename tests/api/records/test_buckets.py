@@ -0,0 +1,90 @@
+"""Test cache of the record of each bucket."""
+
+import pytest
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_records_files.models import RecordsBuckets
+
+from cd2h_repo_project.modules.records import api
+from cd2h_repo_project.modules.records.api import Deposit, RecordType
+from cd2h_repo_project.modules.records.buckets import KEY, get_bucket_record
+from cd2h_repo_project.modules.records.permissions import RecordPermissions
+
+
+def cached(bucket_id):
+    return current_cache.get(KEY.format(bucket_id))
+
+
+def test_deposit_creation_caches_its_bucket(create_record):
+    deposit = create_record(published=False)
+    bucket_id = deposit['_buckets']['deposit']
+
+    assert cached(bucket_id) == {
+        'id': str(deposit.id),
+        'revision_id': 0,
+        'type': RecordType.draft.value,
+        'permissions': deposit['permissions'],
+        '_deposit': {'owners': deposit['_deposit']['owners'], 'pid': {}},
+    }
+
+
+def test_rolled_back_deposit_creation_caches_nothing(
+        create_record, mocker):
+    spied_cache = mocker.spy(api, 'cache_bucket_record_on_commit')
+    mocker.patch.object(
+        Deposit, 'publish', side_effect=RuntimeError('Publish failed')
+    )
+
+    with pytest.raises(RuntimeError):
+        create_record()
+    db.session.rollback()
+    db.session.commit()
+
+    bucket_id = spied_cache.call_args[0][0]
+    assert cached(bucket_id) is None
+    assert get_bucket_record(bucket_id) is None
+
+
+def test_publish_caches_all_buckets(create_record):
+    record = create_record()
+    bucket_ids = [
+        str(rb.bucket_id)
+        for rb in RecordsBuckets.query.filter_by(record_id=record.id)
+    ]
+
+    assert bucket_ids
+    for bucket_id in bucket_ids:
+        assert cached(bucket_id)['id'] == str(record.id)
+        assert cached(bucket_id)['type'] == RecordType.published.value
+
+
+def test_update_drops_cached_record_on_commit(create_record):
+    deposit = create_record(published=False)
+    bucket_id = deposit['_buckets']['deposit']
+
+    deposit['permissions'] = RecordPermissions.PRIVATE_VIEW
+    deposit.commit()
+
+    assert cached(bucket_id) is not None
+
+    db.session.commit()
+
+    assert cached(bucket_id) is None
+    assert get_bucket_record(bucket_id)['permissions'] == (
+        RecordPermissions.PRIVATE_VIEW
+    )
+
+
+def test_miss_is_resolved_from_database(create_record):
+    deposit = create_record(published=False)
+    bucket_id = deposit['_buckets']['deposit']
+    current_cache.delete(KEY.format(bucket_id))
+
+    record = get_bucket_record(bucket_id)
+
+    assert record['id'] == str(deposit.id)
+    assert cached(bucket_id) == record
+
+
+def test_unknown_bucket(db):
+    assert get_bucket_record('00000000-0000-0000-0000-000000000000') is None
@@ -0,0 +1,126 @@
+"""Test JSON encoders of the serializers."""
+
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from flask import json
+
+from cd2h_repo_project.modules.records.serializers import encoders
+from cd2h_repo_project.modules.records.serializers.encoders import (
+    json_dumps, to_ascii
+)
+
+COMPACT = {'indent': None, 'separators': (',', ':')}
+PRETTY = {'indent': 2, 'separators': (', ', ': ')}
+
+PAYLOADS = [
+    {},
+    [],
+    {
+        'hits': {
+            'hits': [
+                {
+                    'id': '1',
+                    'metadata': {
+                        'title': 'Étude des « cellules »   \U0001f9ec',
+                        'authors': [{'full_name': 'Ñúñez, Zoë'}],
+                        'terms': [{'source': 'MeSH', 'value': 'Cognition'}],
+                        'resource_type': {
+                            'full_hierarchy': ['other', 'other']
+                        },
+                    },
+                    'links': {'self': 'https://localhost/api/records/1'},
+                    'created': '2019-03-04T20:43:47.139454+00:00',
+                    'updated': None,
+                }
+            ],
+            'total': 1,
+        },
+        'links': {},
+        'aggregations': {
+            'license': {'buckets': [{'doc_count': 1, 'key': 'cc-by'}]},
+        },
+    },
+    {'z': 'control \x00\x1f\x7f\n\t"\\/ chars', 'a': [True, False, None]},
+    {
+        'datetime': datetime(2019, 3, 4, 20, 43, 47),
+        'uuid': UUID('8a2e2d3c-0dfb-4b44-a0bb-4f3b0b0f5e93'),
+    },
+    # orjson can't encode these: flask.json is used
+    {1: 'integer key'},
+    {'big': 2 ** 70},
+]
+
+
+@pytest.fixture
+def json_encoder(config):
+    original = {
+        key: config[key] for key in ['RECORDS_JSON_ENCODER', 'JSON_AS_ASCII']
+    }
+    yield config
+    config.update(original)
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+@pytest.mark.parametrize('as_ascii', [True, False])
+def test_orjson_output_is_flask_json_output(json_encoder, payload, as_ascii):
+    pytest.importorskip('orjson')
+    json_encoder['RECORDS_JSON_ENCODER'] = 'orjson'
+    json_encoder['JSON_AS_ASCII'] = as_ascii
+
+    assert json_dumps(payload, **COMPACT) == json.dumps(payload, **COMPACT)
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_ascii_escapes_are_flask_json_escapes(json_encoder, payload):
+    json_encoder['JSON_AS_ASCII'] = False
+    text = json.dumps(payload, **COMPACT)
+    json_encoder['JSON_AS_ASCII'] = True
+
+    assert to_ascii(text) == json.dumps(payload, **COMPACT)
+
+
+def test_flask_json_is_the_default(config, mocker):
+    spied_orjson_dumps = mocker.spy(encoders, '_orjson_dumps')
+
+    assert json_dumps(PAYLOADS[2], **COMPACT) == json.dumps(
+        PAYLOADS[2], **COMPACT
+    )
+    assert not spied_orjson_dumps.called
+
+
+def test_pretty_output_uses_flask_json(json_encoder, mocker):
+    json_encoder['RECORDS_JSON_ENCODER'] = 'orjson'
+    spied_orjson_dumps = mocker.spy(encoders, '_orjson_dumps')
+
+    assert json_dumps(PAYLOADS[2], **PRETTY) == json.dumps(
+        PAYLOADS[2], **PRETTY
+    )
+    assert not spied_orjson_dumps.called
+
+
+def test_missing_orjson_falls_back_to_flask_json(json_encoder, mocker):
+    json_encoder['RECORDS_JSON_ENCODER'] = 'orjson'
+    mocker.patch.object(encoders, '_orjson', return_value=None)
+
+    assert json_dumps(PAYLOADS[2], **COMPACT) == json.dumps(
+        PAYLOADS[2], **COMPACT
+    )
+
+
+def test_records_api_responses_are_identical(
+        client, create_record, json_encoder):
+    pytest.importorskip('orjson')
+    record = create_record({'title': 'Étude des « cellules »'})
+    paths = [
+        '/records/',
+        '/records/?prettyprint=1',
+        '/records/{}'.format(record['id']),
+    ]
+
+    json_encoder['RECORDS_JSON_ENCODER'] = 'json'
+    responses = [client.get(p).data for p in paths]
+    json_encoder['RECORDS_JSON_ENCODER'] = 'orjson'
+
+    assert [client.get(p).data for p in paths] == responses
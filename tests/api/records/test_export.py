@@ -0,0 +1,124 @@
+"""Test bulk export of records."""
+
+import csv
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+from flask.cli import ScriptInfo
+
+from cd2h_repo_project.modules.records.cli import export_records_cli
+from cd2h_repo_project.modules.records.permissions import RecordPermissions
+from utils import login_request_and_session
+
+
+@pytest.fixture
+def exported_records(create_record, create_user):
+    owner = create_user()
+    return {
+        'public': create_record({'title': 'Public'}),
+        'other': create_record({'title': 'Other'}),
+        'private': create_record({
+            'title': 'Private',
+            'permissions': RecordPermissions.PRIVATE_VIEW,
+            '_deposit': {'owners': [owner.id]}
+        }),
+        'unpublished': create_record(
+            {'title': 'Unpublished'}, published=False
+        ),
+        'owner': owner,
+    }
+
+
+@pytest.fixture
+def small_chunks(config):
+    original_chunk_size = config['RECORDS_EXPORT_CHUNK_SIZE']
+    # Go through several scroll requests
+    config['RECORDS_EXPORT_CHUNK_SIZE'] = 1
+    yield
+    config['RECORDS_EXPORT_CHUNK_SIZE'] = original_chunk_size
+
+
+def jsonl_titles(data):
+    return sorted(
+        json.loads(line)['metadata']['title'] for line in data.splitlines()
+    )
+
+
+def test_export_streams_visible_records_as_json_lines(
+        client, exported_records, small_chunks):
+    response = client.get('/export/records')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == (
+        'attachment; filename=records.jsonl'
+    )
+    assert response.is_streamed
+    data = response.get_data(as_text=True)
+    assert jsonl_titles(data) == ['Other', 'Public']
+
+    line = json.loads(data.splitlines()[0])
+    assert line['id'] == line['metadata']['id']
+    assert line['links']['self'].endswith('/api/records/' + line['id'])
+    assert '_deposit' not in line['metadata']
+
+
+def test_export_includes_records_visible_to_the_user(
+        client, exported_records):
+    login_request_and_session(exported_records['owner'], client)
+
+    response = client.get('/export/records')
+
+    assert jsonl_titles(response.get_data(as_text=True)) == [
+        'Other', 'Private', 'Public'
+    ]
+
+
+def test_export_csv(client, exported_records):
+    response = client.get('/export/records?format=csv')
+
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert sorted(row['title'] for row in rows) == ['Other', 'Public']
+    row = next(row for row in rows if row['title'] == 'Public')
+    assert row['id'] == exported_records['public']['id']
+    assert row['authors'] == 'Author, An'
+    assert row['resource_type'] == 'other; other'
+    assert row['link'].endswith('/api/records/' + row['id'])
+
+
+def test_export_csl(client, exported_records):
+    response = client.get('/export/records?format=csl')
+
+    assert response.mimetype == 'application/vnd.citationstyles.csl+json'
+    items = json.loads(response.get_data(as_text=True))
+    assert sorted(item['title'] for item in items) == ['Other', 'Public']
+    assert items[0]['type']
+    assert items[0]['author'] == [{'family': 'author', 'given': 'An'}]
+
+
+def test_export_of_no_records(client, es_clear):
+    response = client.get('/export/records?format=csl')
+
+    assert json.loads(response.get_data(as_text=True)) == []
+
+
+def test_export_unknown_format(client):
+    response = client.get('/export/records?format=xml')
+
+    assert response.status_code == 400
+
+
+def test_export_cli_exports_public_records(
+        app, exported_records, small_chunks):
+    runner = CliRunner()
+    script_info = ScriptInfo(create_app=lambda info: app)
+
+    result = runner.invoke(
+        export_records_cli, ['--format', 'jsonl'], obj=script_info
+    )
+
+    assert result.exit_code == 0
+    assert jsonl_titles(result.output) == ['Other', 'Public']
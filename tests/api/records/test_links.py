@@ -1,6 +1,10 @@
 from unittest.mock import patch
 
-from cd2h_repo_project.modules.records.links import deposit_links_api_factory
+from invenio_pidstore.models import PersistentIdentifier
+
+from cd2h_repo_project.modules.records.links import (
+    deposit_links_api_factory, record_links_api_factory
+)
 
 
 def test_deposit_links_api_factory_contains_bucket(app, create_record):
@@ -58,3 +62,17 @@ def test_deposit_links_api_factory_contains_record_html(app, create_record):
 
     expected_link = 'http://localhost:5000/records/' + expected_pid_value
     assert links['record_html'] == expected_link
+
+
+def test_record_links_api_factory(app, create_record):
+    record = create_record()
+    pid_value = record['id']
+
+    links = record_links_api_factory(
+        PersistentIdentifier.get('recid', pid_value)
+    )
+
+    assert links == {
+        'self': 'http://localhost:5000/api/records/' + pid_value,
+        'html': 'http://localhost:5000/records/' + pid_value,
+    }
@@ -328,6 +328,25 @@ def test_view_permission_factory(
     assert permission.can() == allowed
 
 
+def test_permission_decisions_are_made_once_per_request(
+        create_user, request_ctx, mocker):
+    user = create_user({'provides': ['menrva-view-published-record']})
+    login_user(user)
+    records = [
+        {
+            'permissions': RecordPermissions.PRIVATE_VIEW,
+            'type': RecordType.published.value
+        }
+        for _ in range(3)
+    ]
+    allows = mocker.spy(Permission, 'allows')
+
+    assert all(
+        ReadFilesPermission(current_user, record).can() for record in records
+    )
+    assert allows.call_count == 1
+
+
 def test_view_permission_factory_unpublished_record():
     record = {'type': RecordType.draft.value}
 
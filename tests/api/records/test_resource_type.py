@@ -0,0 +1,47 @@
+"""Test resource type registry."""
+
+import pytest
+
+from cd2h_repo_project.modules.records.resource_type import (
+    ResourceType, ResourceTypeHierarchy, resource_type_registry
+)
+
+
+def test_registry_is_loaded_once():
+    assert resource_type_registry() is resource_type_registry()
+
+
+def test_registry_mappings():
+    registry = resource_type_registry()
+    key = ('multimedia', 'animation')
+
+    assert registry.hierarchy[key] == ('image', 'moving image', 'animation')
+    assert registry.csl[key] == 'motion_picture'
+    assert registry.datacite[key] == 'Audiovisual'
+
+
+def test_registry_is_read_only():
+    registry = resource_type_registry()
+
+    with pytest.raises(TypeError):
+        registry.csl[('dataset', 'dataset')] = 'article'
+
+
+def test_validity():
+    registry = resource_type_registry()
+
+    assert registry.is_valid('articles', 'journal article')
+    assert not registry.is_valid('articles', 'dataset')
+    assert not registry.is_valid('nope', 'dataset')
+    assert ResourceType.get('articles', 'dataset') is None
+
+
+def test_hierarchy_returns_new_lists():
+    hierarchy = ResourceTypeHierarchy()
+    key = ('dataset', 'dataset')
+
+    full_hierarchy = hierarchy.get(key)
+    full_hierarchy.append('modified')
+
+    assert hierarchy.get(key) == ['dataset', 'dataset']
+    assert hierarchy.get(('nope', 'nope'), []) == []
@@ -11,6 +11,7 @@ from werkzeug.datastructures import MultiDict
 from cd2h_repo_project.modules.records.api import RecordType
 from cd2h_repo_project.modules.records.permissions import RecordPermissions
 from cd2h_repo_project.modules.records.search import RecordsSearch
+from cd2h_repo_project.utils import SingleFlight
 from utils import login_request_and_session
 
 
@@ -436,6 +437,28 @@ class TestRecordsSearch(object):
         )
         assert_single_hit(response, record1)
 
+    def test_searches_are_coalesced_per_permission_filter(
+            self, app, client, create_record, create_user, es_clear,
+            mocker):
+        record = create_record()
+        flight = SingleFlight()
+        mocker.patch.object(
+            app.extensions['cd2h-records'], 'search_flight', flight
+        )
+        do = mocker.spy(flight, 'do')
+
+        client.get("/records/")
+        response = client.get("/records/")
+        user = create_user()
+        login_request_and_session(user, client)
+        client.get("/records/")
+
+        assert_single_hit(response, record)
+        keys = [args[0] for args, _ in do.call_args_list]
+        assert len(keys) == 3
+        assert keys[0] == keys[1]
+        assert keys[1] != keys[2]
+
 
 class TestDepositsSearch(object):
 
@@ -1,14 +1,21 @@
+from copy import deepcopy
 from datetime import date
 
 import pytest
 from invenio_formatter.filters.datetime import from_isodate
+from invenio_pidstore import current_pidstore
+from invenio_pidstore.fetchers import FetchedPID
 from invenio_pidstore.models import PersistentIdentifier
+from invenio_search import current_search_client
 
 from cd2h_repo_project.modules.records.marshmallow import CSLRecordSchemaV1
 from cd2h_repo_project.modules.records.serializers import citeproc_v1, json_v1
 from cd2h_repo_project.modules.records.serializers.json import (
     MenRvaJSONSerializer
 )
+from cd2h_repo_project.modules.records.serializers.projections import (
+    record_hit_v1
+)
 
 
 class TestJsonV1(object):
@@ -244,6 +251,146 @@ class TestMenRvaJSONSerializer(object):
             "sum_other_doc_count": 0
         }
 
+    def test_transform_aggregation_does_not_modify_aggregation(self):
+        aggregation_result = {
+            'license': {'buckets': [{'doc_count': 1, 'key': 'cc-by'}]},
+            'authors': {
+                'doc_count': 1,
+                'full_name': {
+                    'buckets': [{'doc_count': 1, 'key': 'Smith, John'}]
+                }
+            },
+            'subjects': {
+                'doc_count': 1,
+                'source': {
+                    'buckets': [
+                        {
+                            'doc_count': 1,
+                            'key': 'MeSH',
+                            'record_count': {'doc_count': 1},
+                            'subject': {
+                                'buckets': [
+                                    {
+                                        'doc_count': 1,
+                                        'key': 'Cognition',
+                                        'record_count': {'doc_count': 1}
+                                    }
+                                ]
+                            }
+                        }
+                    ]
+                }
+            }
+        }
+        original_aggregation_result = deepcopy(aggregation_result)
+
+        transformed_search_result = (
+            MenRvaJSONSerializer().transform_aggregation(aggregation_result)
+        )
+
+        assert aggregation_result == original_aggregation_result
+        assert transformed_search_result is not aggregation_result
+        # Untransformed entries are shared rather than copied
+        assert (
+            transformed_search_result['license'] is
+            aggregation_result['license']
+        )
+        assert transformed_search_result['authors'] is (
+            aggregation_result['authors']['full_name']
+        )
+        assert transformed_search_result['subjects']['buckets'][0][
+            'subject']['buckets'] == [{'doc_count': 1, 'key': 'Cognition'}]
+
+
+def links_factory(pid, record_hit=None, **kwargs):
+    return {'self': 'https://localhost/api/records/{}'.format(pid.pid_value)}
+
+
+def assert_projection_parity(pid, hit, **kwargs):
+    original_hit = deepcopy(hit)
+
+    projected = record_hit_v1(pid, hit, links_factory=links_factory, **kwargs)
+
+    # The marshmallow path modifies the hit
+    assert projected == json_v1.transform_search_hit(
+        pid, deepcopy(hit), links_factory=links_factory, **kwargs
+    )
+    assert hit == original_hit
+
+
+class TestRecordHitProjection(object):
+    """Parity of record_hit_v1 with the RecordSchemaV1 dump of search hits."""
+
+    def test_indexed_records(self, create_record, es_clear):
+        create_record()
+        create_record({
+            'authors': [
+                {
+                    'first_name': 'Jane',
+                    'middle_name': 'J',
+                    'last_name': 'Doe',
+                    'full_name': 'Doe, Jane J'
+                }
+            ],
+            'terms': [
+                {'source': 'MeSH', 'value': 'Cognition', 'id': 'D003071'},
+                {'source': 'FAST', 'value': 'Cognition', 'id': '866405'},
+            ],
+        })
+        create_record(published=False)
+        fetcher = current_pidstore.fetchers['recid']
+
+        search_result = current_search_client.search(index='records')
+        hits = search_result['hits']['hits']
+
+        assert len(hits) == 3
+        for hit in hits:
+            assert '_created' in hit['_source']
+            assert_projection_parity(fetcher(hit['_id'], hit['_source']), hit)
+
+    @pytest.mark.parametrize('source', [
+        {},
+        {'title': None, 'authors': None, 'resource_type': None, 'terms': None},
+        {
+            'title': 1234,
+            'authors': [{'last_name': 'Doe', 'orcid': '0000'}],
+            'resource_type': {'general': 'dataset', 'full_hierarchy': None},
+            'terms': [{}],
+            '_created': '2019-01-01T00:00:00+00:00',
+            '_deposit': {'owners': [1]},
+            '_files': [{'key': 'file.txt'}],
+        },
+    ])
+    def test_incomplete_hits(self, source):
+        hit = {'_id': 'abc', '_version': 1, '_source': source}
+        pid = FetchedPID(provider=None, pid_type='recid', pid_value='1')
+
+        assert_projection_parity(pid, hit)
+        assert_projection_parity(None, hit)
+        assert_projection_parity(
+            pid, hit, marshmallow_context={'pid': None}
+        )
+
+    def test_serializer_uses_projection(self, mocker):
+        projection = mocker.Mock(return_value={'id': '1'})
+        serializer = MenRvaJSONSerializer(hit_projection=projection)
+        hit = {'_id': 'abc', '_version': 1, '_source': {}}
+
+        assert serializer.transform_search_hit('pid', hit) == {'id': '1'}
+        projection.assert_called_once_with('pid', hit, links_factory=None)
+
+    def test_records_endpoint_projects_hits(self, client, create_record):
+        record = create_record()
+
+        response = client.get('/records/')
+
+        hit = response.json['hits']['hits'][0]
+        assert hit['id'] == record['id']
+        assert hit['metadata']['id'] == record['id']
+        assert hit['metadata']['title'] == record['title']
+        assert hit['created']
+        assert '_deposit' not in hit['metadata']
+
 
 class TestCSLSerializer(object):
     """Citation serializer tests."""
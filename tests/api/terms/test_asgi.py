@@ -0,0 +1,181 @@
+"""Test asynchronous term suggestion service."""
+
+import asyncio
+import json
+from os.path import dirname, join, realpath
+
+import pytest
+
+from cd2h_repo_project.modules.terms.asgi import SuggestApp
+from cd2h_repo_project.modules.terms.fast import FAST
+from cd2h_repo_project.modules.terms.loaders import (
+    fast_indexable, mesh_indexable
+)
+from cd2h_repo_project.modules.terms.mesh import MeSH
+from cd2h_repo_project.modules.terms.prefix_index import build
+from utils import login_request_and_session
+
+
+def filepath(filename):
+    return join(dirname(realpath(__file__)), filename)
+
+
+@pytest.fixture
+def prefix_index_backend(app, tmpdir):
+    terms = MeSH.load(filepath('descriptors_test_file.txt'), filter='topics')
+    indexables = [mesh_indexable(t) for t in terms]
+    terms = FAST.load(filepath('fast_test_file.nt'))
+    indexables.extend(fast_indexable(t) for t in terms)
+
+    path = str(tmpdir.join('terms.prefix_index'))
+    build(path, indexables)
+
+    config = {
+        'TERMS_SUGGEST_BACKEND': 'prefix_index',
+        'TERMS_PREFIX_INDEX_PATH': path,
+    }
+    original = {key: app.config[key] for key in config}
+    app.config.update(config)
+    yield
+    app.config.update(original)
+
+
+@pytest.fixture
+def asgi_app(app, prefix_index_backend):
+    return SuggestApp(app)
+
+
+@pytest.fixture
+def session_cookie(app, client, create_user):
+    user = create_user()
+    login_request_and_session(user, client)
+    cookie = next(
+        c for c in client.cookie_jar if c.name == app.session_cookie_name
+    )
+    return '{}={}'.format(cookie.name, cookie.value)
+
+
+def asgi_request(asgi_app, path, query_string=b'', method='GET', body=b'',
+                 headers=()):
+    """Return (status, headers, body) of a request to `asgi_app`."""
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [
+            (name.encode('latin-1'), value.encode('latin-1'))
+            for name, value in headers
+        ],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.get_event_loop().run_until_complete(
+        asgi_app(scope, receive, send)
+    )
+    start, response_body = messages
+    return (
+        start['status'],
+        {
+            name.decode('latin-1'): value.decode('latin-1')
+            for name, value in start['headers']
+        },
+        response_body['body']
+    )
+
+
+def test_suggestions_match_api(asgi_app, client, session_cookie):
+    for path in ['/terms/_suggest', '/terms/mesh/_suggest',
+                 '/terms/fast/_suggest']:
+        status, headers, body = asgi_request(
+            asgi_app, '/api' + path, query_string=b'q=con&limit=3',
+            headers=[('Cookie', session_cookie)]
+        )
+
+        response = client.get(path, query_string={'q': 'con', 'limit': 3})
+        assert status == 200
+        assert json.loads(body.decode('utf-8')) == response.json
+        assert headers['etag'] == response.headers['ETag']
+
+
+def test_suggestions_are_revalidated(asgi_app, session_cookie):
+    request = {
+        'path': '/api/terms/_suggest',
+        'query_string': b'q=See',
+    }
+    _, headers, _ = asgi_request(
+        asgi_app, headers=[('Cookie', session_cookie)], **request
+    )
+
+    status, _, body = asgi_request(
+        asgi_app,
+        headers=[
+            ('Cookie', session_cookie), ('If-None-Match', headers['etag'])
+        ],
+        **request
+    )
+
+    assert status == 304
+    assert body == b''
+
+
+def test_batch_suggestions(asgi_app, session_cookie):
+    status, _, body = asgi_request(
+        asgi_app, '/api/terms/_suggest', method='POST',
+        body=json.dumps({
+            'mesh': {'q': 'See', 'source': 'MeSH'},
+            'fast': {'q': 'Con', 'source': 'FAST', 'limit': 1},
+        }).encode('utf-8'),
+        headers=[('Cookie', session_cookie)]
+    )
+
+    terms = json.loads(body.decode('utf-8'))['terms']
+    assert status == 200
+    assert [t['value']['id'] for t in terms['mesh']] == ['D000068098']
+    assert [t['value']['id'] for t in terms['fast']] == ['1045901']
+
+    status, _, _ = asgi_request(
+        asgi_app, '/api/terms/_suggest', method='POST',
+        body=json.dumps({'mesh': {'q': 'See', 'source': 'Nope'}})
+        .encode('utf-8'),
+        headers=[('Cookie', session_cookie)]
+    )
+
+    assert status == 400
+
+
+def test_anonymous_user_is_unauthorized(asgi_app):
+    status, _, _ = asgi_request(
+        asgi_app, '/api/terms/_suggest', query_string=b'q=See'
+    )
+
+    assert status == 401
+
+    status, _, _ = asgi_request(
+        asgi_app, '/api/terms/_suggest', query_string=b'q=See',
+        headers=[('Cookie', 'session=unknown')]
+    )
+
+    assert status == 401
+
+
+def test_other_routes_are_not_served(asgi_app, session_cookie):
+    status, _, _ = asgi_request(
+        asgi_app, '/api/terms/_suggest/stats',
+        headers=[('Cookie', session_cookie)]
+    )
+
+    assert status == 404
+
+    status, _, _ = asgi_request(
+        asgi_app, '/api/terms/mesh/_suggest', method='POST',
+        headers=[('Cookie', session_cookie)]
+    )
+
+    assert status == 405
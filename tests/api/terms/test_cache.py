@@ -0,0 +1,134 @@
+"""Test suggestion cache."""
+
+from cd2h_repo_project.modules.terms.cache import (
+    SuggestionCache, ThrottledValue, normalize_key
+)
+from utils import login_request_and_session
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Generation(object):
+    def __init__(self):
+        self.value = 'terms-a'
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def make_cache(**kwargs):
+    clock = Clock()
+    generation = Generation()
+    cache = SuggestionCache(generation, clock=clock, **kwargs)
+    return cache, clock, generation
+
+
+def test_normalize_key_is_case_insensitive():
+    assert normalize_key('SeE', None, 5) == normalize_key('see', None, 5)
+    assert normalize_key('see', None, 5) != normalize_key('see', 'MeSH', 5)
+    assert normalize_key('see', None, 5) != normalize_key('see', None, 3)
+
+
+def test_get_or_set_computes_once():
+    cache, clock, generation = make_cache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{'name': '(MeSH) Seed Bank'}]
+
+    assert cache.get_or_set('k', compute) == [{'name': '(MeSH) Seed Bank'}]
+    assert cache.get_or_set('k', compute) == [{'name': '(MeSH) Seed Bank'}]
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_empty_suggestions_are_cached():
+    cache, clock, generation = make_cache()
+    cache.set('k', [])
+
+    assert cache.get('k') == []
+
+
+def test_entries_expire():
+    cache, clock, generation = make_cache(ttl=10)
+    cache.set('k', ['v'])
+
+    clock.now = 9
+    assert cache.get('k') == ['v']
+
+    clock.now = 10
+    assert cache.get('k') is None
+
+
+def test_least_recently_used_is_evicted():
+    cache, clock, generation = make_cache(maxsize=2)
+    cache.set('a', ['a'])
+    cache.set('b', ['b'])
+    cache.get('a')
+    cache.set('c', ['c'])
+
+    assert cache.get('a') == ['a']
+    assert cache.get('b') is None
+    assert cache.get('c') == ['c']
+
+
+def test_new_generation_invalidates_entries():
+    cache, clock, generation = make_cache(generation_interval=5)
+    cache.set('k', ['v'])
+    generation.value = 'terms-b'
+
+    clock.now = 4
+    assert cache.get('k') == ['v']
+
+    clock.now = 5
+    assert cache.get('k') is None
+    assert cache.stats()['generation'] == 'terms-b'
+
+
+def test_generation_is_checked_at_most_every_interval():
+    cache, clock, generation = make_cache(generation_interval=5)
+
+    for _ in range(10):
+        cache.get('k')
+
+    assert generation.calls == 1
+
+
+def test_throttled_value_is_fetched_at_most_every_interval():
+    clock = Clock()
+    generation = Generation()
+    version = ThrottledValue(clock=clock)
+
+    assert version.get(generation, 5) == 'terms-a'
+    generation.value = 'terms-b'
+    clock.now = 4
+    assert version.get(generation, 5) == 'terms-a'
+    clock.now = 5
+    assert version.get(generation, 5) == 'terms-b'
+    assert generation.calls == 2
+
+
+def test_stats_view_is_admin_only(client, create_user, super_user):
+    user = create_user()
+    login_request_and_session(user, client)
+
+    response = client.get('/terms/_suggest/stats')
+
+    assert response.status_code == 403
+
+    login_request_and_session(super_user, client)
+
+    response = client.get('/terms/_suggest/stats')
+
+    assert response.status_code == 200
+    assert 'hits' in response.json['cache']
@@ -2,6 +2,8 @@
 
 from os.path import dirname, join, realpath
 
+import pytest
+
 from cd2h_repo_project.modules.terms.fast import FAST
 
 
@@ -62,3 +64,35 @@ class TestFAST(object):
         ]
 
         FAST.filename = tmp_filename
+
+    @pytest.mark.parametrize(
+        'filename', ['fast_test_file.nt', 'fast_test_file.nt.zip']
+    )
+    def test_scan_engine_matches_rdflib_engine(self, filename):
+        filepath = join(dirname(realpath(__file__)), filename)
+
+        scanned_topics = FAST.load(filepath, engine='scan')
+
+        assert scanned_topics == FAST.load(filepath, engine='rdflib')
+
+    def test_scan_decodes_literals(self):
+        lines = [
+            b'<http://id.worldcat.org/fast/1749678> '
+            b'<http://www.w3.org/2004/02/skos/core#prefLabel> '
+            b'"Eik\\u014Dn (The \\"Greek\\" word)"@en .\n',
+            b'<http://id.worldcat.org/fast/1749678> '
+            b'<http://schema.org/name> "Eik\\u014Dn" .\n',
+        ]
+
+        topics = list(FAST.scan(lines))
+
+        assert topics == [
+            {
+                'prefLabel': 'Eik\u014Dn (The "Greek" word)',
+                'identifier': 1749678,
+            }
+        ]
+
+    def test_load_unknown_engine_raises(self):
+        with pytest.raises(ValueError):
+            FAST.load(TestFAST.filepath(), engine='unknown')
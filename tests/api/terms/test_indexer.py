@@ -0,0 +1,201 @@
+"""Test terms bulk indexing."""
+
+from collections import Counter
+
+import pytest
+
+from cd2h_repo_project.modules.terms.indexer import (
+    aliased_indices, bulk_load_mode, bulk_results, count_by_source,
+    create_index, delete_indices, incremental_actions, new_index_name,
+    stamp_vocabulary_version, swap_aliases, vocabulary_version
+)
+from cd2h_repo_project.modules.terms.loaders import (
+    ALIAS, DOC_TYPE, INDEX, fast_indexable, mesh_indexable, with_fingerprint
+)
+
+
+@pytest.mark.parametrize('threads', [1, 2])
+def test_bulk_results_yields_result_per_action(es, es_clear, threads):
+    topics = [
+        {'identifier': 943672, 'prefLabel': 'Glucagonoma'},
+        {'identifier': 813916, 'prefLabel': 'Architecture, Regency'},
+        {'identifier': 1045901, 'prefLabel': 'Onions--Control'},
+    ]
+    actions = (fast_indexable(t) for t in topics)
+
+    results = list(bulk_results(es, actions, chunk_size=2, threads=threads))
+
+    assert len(results) == 3
+    assert all(ok for ok, item in results)
+    es.indices.refresh(index=INDEX)
+    assert es.count(index=INDEX)['count'] == 3
+
+
+def test_bulk_results_yields_failures(es, es_clear):
+    actions = [
+        # Updating a missing document fails
+        {
+            '_op_type': 'update',
+            '_index': INDEX,
+            '_type': DOC_TYPE,
+            '_id': 'D000015',
+            'doc': {'value': 'Abnormalities, Multiple'}
+        },
+        fast_indexable({'identifier': 943672, 'prefLabel': 'Glucagonoma'}),
+    ]
+
+    results = list(bulk_results(es, actions))
+
+    assert [ok for ok, item in results] == [False, True]
+
+
+def get_index_settings(es, keys):
+    settings = es.indices.get_settings(
+        index=INDEX, name=','.join(keys), flat_settings=True
+    )
+    return {
+        key: settings[INDEX]['settings'].get(key) for key in keys
+    }
+
+
+class TestBulkLoadMode(object):
+    keys = [
+        'index.refresh_interval',
+        'index.number_of_replicas',
+        'index.translog.durability'
+    ]
+
+    def test_suspends_and_restores_settings(self, es, es_clear):
+        original_settings = get_index_settings(es, self.keys)
+
+        with bulk_load_mode(es, INDEX, async_translog=True):
+            assert get_index_settings(es, self.keys) == {
+                'index.refresh_interval': '-1',
+                'index.number_of_replicas': '0',
+                'index.translog.durability': 'async',
+            }
+
+        assert get_index_settings(es, self.keys) == original_settings
+
+    def test_restores_settings_on_failure(self, es, es_clear):
+        original_settings = get_index_settings(es, self.keys)
+
+        with pytest.raises(RuntimeError):
+            with bulk_load_mode(es, INDEX):
+                raise RuntimeError('Failed load')
+
+        assert get_index_settings(es, self.keys) == original_settings
+
+    def test_loaded_documents_are_searchable(self, es, es_clear):
+        topic = {'identifier': 943672, 'prefLabel': 'Glucagonoma'}
+
+        with bulk_load_mode(es, INDEX):
+            list(bulk_results(es, [fast_indexable(topic)]))
+
+        assert es.count(index=INDEX)['count'] == 1
+
+
+@pytest.fixture
+def new_index(es, es_clear):
+    """New concrete terms index. Original terms index is restored after."""
+    name = new_index_name()
+    create_index(es, name)
+
+    yield name
+
+    es.indices.delete(index=name, ignore=[404])
+    if not es.indices.exists(index=INDEX):
+        create_index(es, INDEX)
+        es.indices.put_alias(index=INDEX, name=ALIAS)
+
+
+class TestAliasSwap(object):
+
+    def test_count_by_source(self, es, new_index):
+        actions = [
+            mesh_indexable(
+                {'MH': 'Seed Bank', 'DC': '1', 'UI': 'D000068098'},
+                index=new_index
+            ),
+            fast_indexable(
+                {'identifier': 943672, 'prefLabel': 'Glucagonoma'},
+                index=new_index
+            ),
+            fast_indexable(
+                {'identifier': 813916, 'prefLabel': 'Architecture, Regency'},
+                index=new_index
+            ),
+        ]
+        list(bulk_results(es, actions))
+        es.indices.refresh(index=new_index)
+
+        assert count_by_source(es, new_index) == {'MeSH': 1, 'FAST': 2}
+
+    def test_swap_aliases_then_delete_old_indices(self, es, new_index):
+        old_indices = swap_aliases(es, new_index)
+
+        assert old_indices == [INDEX]
+        assert aliased_indices(es, ALIAS) == [new_index]
+
+        delete_indices(es, old_indices, new_index)
+
+        assert aliased_indices(es, INDEX) == [new_index]
+
+    def test_swap_aliases_moves_index_alias(self, es, new_index):
+        delete_indices(es, swap_aliases(es, new_index), new_index)
+        newer_index = new_index_name()
+        create_index(es, newer_index)
+
+        try:
+            old_indices = swap_aliases(es, newer_index)
+
+            assert old_indices == [new_index]
+            assert aliased_indices(es, ALIAS) == [newer_index]
+            assert aliased_indices(es, INDEX) == [newer_index]
+        finally:
+            es.indices.delete(index=newer_index, ignore=[404])
+
+
+def test_vocabulary_version_changes_when_stamped(es, es_clear):
+    version = vocabulary_version(es)
+
+    stamped = stamp_vocabulary_version(es)
+
+    new_version = vocabulary_version(es)
+    assert new_version != version
+    assert new_version.endswith(':' + stamped)
+
+
+def test_incremental_actions(es, es_clear):
+    def indexables(topics):
+        return [with_fingerprint(fast_indexable(t)) for t in topics]
+
+    live_topics = [
+        {'identifier': 943672, 'prefLabel': 'Glucagonoma'},
+        {'identifier': 813916, 'prefLabel': 'Architecture, Regency'},
+        {'identifier': 994564, 'prefLabel': 'Lead--History'},  # obsoleted
+    ]
+    mesh_term = with_fingerprint(
+        mesh_indexable({'MH': 'Seed Bank', 'DC': '1', 'UI': 'D000068098'})
+    )
+    list(bulk_results(es, indexables(live_topics) + [mesh_term]))
+    es.indices.refresh(index=INDEX)
+    new_topics = [
+        {'identifier': 943672, 'prefLabel': 'Glucagonoma'},
+        {'identifier': 813916, 'prefLabel': 'Architecture, Georgian'},
+        {'identifier': 1738210, 'prefLabel': 'Broad beechfern'},
+    ]
+    changes = Counter()
+
+    actions = list(
+        incremental_actions(
+            es, indexables(new_topics), 'FAST', changes=changes
+        )
+    )
+
+    assert [(a.get('_op_type', 'index'), a['_id']) for a in actions] == [
+        ('index', 813916),
+        ('index', 1738210),
+        ('delete', '994564'),
+    ]
+    assert changes == Counter(create=1, update=1, delete=1, unchanged=1)
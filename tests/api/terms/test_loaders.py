@@ -6,7 +6,8 @@ import pytest
 from elasticsearch.helpers import bulk
 
 from cd2h_repo_project.modules.terms.loaders import (
-    DOC_TYPE, INDEX, fast_indexable, mesh_indexable
+    DOC_TYPE, INDEX, fast_indexable, fingerprint, mesh_indexable,
+    with_fingerprint
 )
 
 
@@ -79,6 +80,31 @@ class TestMeSHLoader(object):
             'suggest': ['Abnormalities, Multiple', 'Abnormalities', 'Multiple']
         }
 
+    def test_indexable_entry_terms_and_tree_numbers(self):
+        mesh_topic = {
+            'MH': 'Neoplasms',
+            'ENTRY': ['Tumors', 'Cancer', 'Neoplasms'],
+            'MN': ['C04'],
+            'DC': '1',
+            'UI': 'D009369'
+        }
+        index_name = 'terms'
+        type_name = 'term-v1.0.0'
+
+        indexable_topic = mesh_indexable(
+            mesh_topic, index=index_name, doc_type=type_name
+        )
+
+        assert indexable_topic == {
+            '_index': index_name,
+            '_type': type_name,
+            '_id': 'D009369',
+            'source': 'MeSH',
+            'value': 'Neoplasms',
+            'suggest': ['Neoplasms', 'Tumors', 'Cancer'],
+            'tree_numbers': ['C04']
+        }
+
     # TODO: Check if es_clear necessary here
     def test_bulk_loading(self, es, es_clear):
         index_name = 'terms'
@@ -178,3 +204,29 @@ class TestFASTLoader(object):
             'Ships',
             'Recognition'
         ]
+
+
+class TestFingerprint(object):
+    """Test term fingerprint."""
+
+    topic = {'identifier': 813916, 'prefLabel': 'Architecture, Regency'}
+
+    def test_same_content_same_fingerprint(self):
+        indexable = fast_indexable(self.topic)
+
+        assert fingerprint(indexable) == fingerprint(
+            fast_indexable(dict(self.topic), index='terms')
+        )
+
+    def test_changed_content_changes_fingerprint(self):
+        indexable = fast_indexable(self.topic)
+        changed_topic = dict(self.topic, prefLabel='Architecture, Georgian')
+
+        assert fingerprint(indexable) != fingerprint(
+            fast_indexable(changed_topic)
+        )
+
+    def test_with_fingerprint_is_stable(self):
+        indexable = with_fingerprint(fast_indexable(self.topic))
+
+        assert indexable['fingerprint'] == fingerprint(indexable)
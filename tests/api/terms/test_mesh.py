@@ -17,42 +17,125 @@ class TestMeSH(object):
         assert topics == [
             {
                 'MH': 'Abnormalities, Multiple',
+                'ENTRY': ['Multiple Abnormalities'],
+                'MN': ['C16.131.077'],
                 'DC': '1',
                 'UI': 'D000015'
             },
             {
                 'MH': 'Seed Bank',
+                'ENTRY': [
+                    'Germplasm Bank', 'Seedbank', 'Seeds Bank',
+                    'Bank, Germplasm', 'Bank, Seed', 'Bank, Seeds',
+                    'Banks, Germplasm', 'Banks, Seed', 'Germplasm Banks',
+                    'Seed Banks', 'Seedbanks'
+                ],
+                'MN': ['N02.278.065.650'],
                 'DC': '1',
                 'UI': 'D000068098'
             },
             {
                 'MH': 'Filariasis',
+                'ENTRY': [
+                    'Elaeophoriasis', 'Filarioidea Infections',
+                    'Infections, Filarioidea', 'Elaeophoriases', 'Filariases',
+                    'Filarioidea Infection', 'Infection, Filarioidea'
+                ],
+                'MN': ['C03.335.508.700.750.361'],
                 'DC': '1',
                 'UI': 'D005368'
             },
             {
                 'MH': 'Congenital Abnormalities',
+                'ENTRY': [
+                    'Birth Defects', 'Congenital Defects', 'Deformities',
+                    'Abnormalities, Congenital', 'Defects, Congenital',
+                    'Abnormality, Congenital', 'Birth Defect',
+                    'Congenital Abnormality', 'Congenital Defect',
+                    'Defect, Birth', 'Defect, Congenital', 'Defects, Birth',
+                    'Deformity'
+                ],
+                'MN': ['C16.131'],
                 'DC': '1',
                 'UI': 'D000013'
             },
             {
                 'MH': 'Abdominal Injuries',
+                'ENTRY': [
+                    'Injuries, Abdominal', 'Abdominal Injury',
+                    'Injury, Abdominal'
+                ],
+                'MN': ['C26.017'],
                 'DC': '1',
                 'UI': 'D000007'
             },
             {
                 'MH': 'Abdominal Neoplasms',
+                'ENTRY': [
+                    'Abdominal Neoplasm', 'Neoplasm, Abdominal',
+                    'Neoplasms, Abdominal'
+                ],
+                'MN': ['C04.588.033'],
                 'DC': '1',
                 'UI': 'D000008'
             },
             {
                 'MH': 'Abbreviations as Topic',
+                'ENTRY': ['Acronyms as Topic'],
+                'MN': ['L01.559.598.400.556.131'],
                 'DC': '1',
                 'UI': 'D000004'
             },
             {
                 'MH': 'Abdomen',
+                'ENTRY': ['Abdomens'],
+                'MN': ['A01.923.047'],
                 'DC': '1',
                 'UI': 'D000005'
             }
         ]
+
+    def test_stream_topics_is_lazy(self):
+        stream = MeSH.stream(TestMeSH.filepath, filter='topics')
+
+        first_topic = next(stream)
+
+        assert first_topic == {
+            'MH': 'Abnormalities, Multiple',
+            'ENTRY': ['Multiple Abnormalities'],
+            'MN': ['C16.131.077'],
+            'DC': '1',
+            'UI': 'D000015'
+        }
+        assert len(list(stream)) == 7
+
+    def test_load_all(self):
+        topics = MeSH.load(TestMeSH.filepath)
+
+        assert len(topics) == 11
+        assert {t['DC'] for t in topics} == {'1', '2', '3', '4'}
+
+    def test_parse_entry_terms_and_tree_numbers(self):
+        lines = [
+            '*NEWRECORD',
+            'MH = Neoplasms',
+            'PRINT ENTRY = Tumors|T191|NON|EQV|NLM (1966)|abcdef',
+            'ENTRY = Cancer|T191|NON|EQV|NLM (1966)|abcdef',
+            'ENTRY = Tumors',
+            'MN = C04',
+            'MN_TH = ignored',
+            'DC = 1',
+            'UI = D009369',
+        ]
+
+        topics = list(MeSH.parse(lines, filter='topics'))
+
+        assert topics == [
+            {
+                'MH': 'Neoplasms',
+                'ENTRY': ['Tumors', 'Cancer'],
+                'MN': ['C04'],
+                'DC': '1',
+                'UI': 'D009369'
+            }
+        ]
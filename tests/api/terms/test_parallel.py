@@ -0,0 +1,76 @@
+"""Test multi-process parsing."""
+
+from functools import partial
+from os.path import dirname, join, realpath
+
+import pytest
+
+from cd2h_repo_project.modules.terms.fast import FAST
+from cd2h_repo_project.modules.terms.mesh import MeSH
+from cd2h_repo_project.modules.terms.parallel import (
+    parallel_parse, record_chunks
+)
+
+
+def filepath(filename):
+    return join(dirname(realpath(__file__)), filename)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100, 1000, 100000])
+def test_mesh_record_chunks_are_aligned(chunk_size):
+    with open(filepath('descriptors_test_file.txt'), 'rb') as f:
+        content = f.read()
+        f.seek(0)
+        chunks = list(
+            record_chunks(f, MeSH.is_record_boundary, chunk_size=chunk_size)
+        )
+
+    assert b''.join(chunks) == content
+    for chunk in chunks:
+        assert chunk.rstrip().splitlines()[-1].startswith(b'UI = ')
+    terms = [t for c in chunks for t in MeSH.parse_chunk(c, 'topics')]
+    assert terms == MeSH.load(filepath('descriptors_test_file.txt'), 'topics')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 500, 5000])
+def test_fast_record_chunks_are_aligned(chunk_size):
+    with open(filepath('fast_test_file.nt'), 'rb') as f:
+        content = f.read()
+        f.seek(0)
+        chunks = list(
+            record_chunks(f, FAST.is_record_boundary, chunk_size=chunk_size)
+        )
+
+    assert b''.join(chunks) == content
+    terms = [t for c in chunks for t in FAST.parse_chunk(c)]
+    assert terms == FAST.load(filepath('fast_test_file.nt'), engine='scan')
+
+
+def test_parallel_parse_keeps_order():
+    with open(filepath('descriptors_test_file.txt'), 'rb') as f:
+        chunks = record_chunks(f, MeSH.is_record_boundary, chunk_size=1)
+
+        terms = list(
+            parallel_parse(partial(MeSH.parse_chunk, filter='all'), chunks, 2)
+        )
+
+    assert terms == MeSH.load(filepath('descriptors_test_file.txt'))
+
+
+def test_mesh_stream_with_workers():
+    topics = MeSH.stream(
+        filepath('descriptors_test_file.txt'), filter='topics', workers=2
+    )
+
+    assert list(topics) == MeSH.load(
+        filepath('descriptors_test_file.txt'), filter='topics'
+    )
+
+
+@pytest.mark.parametrize(
+    'filename', ['fast_test_file.nt', 'fast_test_file.nt.zip']
+)
+def test_fast_stream_with_workers(filename):
+    topics = FAST.stream(filepath(filename), workers=2)
+
+    assert list(topics) == FAST.load(filepath(filename))
@@ -0,0 +1,110 @@
+"""Test local prefix index."""
+
+from os.path import dirname, join, realpath
+
+import pytest
+from elasticsearch.helpers import bulk
+
+from cd2h_repo_project.modules.terms.constants import FAST_SOURCE, MESH_SOURCE
+from cd2h_repo_project.modules.terms.fast import FAST
+from cd2h_repo_project.modules.terms.loaders import (
+    INDEX, fast_indexable, mesh_indexable
+)
+from cd2h_repo_project.modules.terms.mesh import MeSH
+from cd2h_repo_project.modules.terms.prefix_index import (
+    PrefixIndex, build, es_terms, normalize
+)
+from cd2h_repo_project.modules.terms.suggester import _suggest_terms
+
+
+def filepath(filename):
+    return join(dirname(realpath(__file__)), filename)
+
+
+def indexables():
+    terms = MeSH.load(filepath('descriptors_test_file.txt'), filter='topics')
+    result = [mesh_indexable(t) for t in terms]
+    terms = FAST.load(filepath('fast_test_file.nt'))
+    result.extend(fast_indexable(t) for t in terms)
+    return result
+
+
+@pytest.fixture
+def prefix_index(tmpdir):
+    path = str(tmpdir.join('terms.prefix_index'))
+    build(path, indexables())
+    index = PrefixIndex(path)
+    yield index
+    index.close()
+
+
+def values(suggestions):
+    return [s['_source']['value'] for s in suggestions]
+
+
+def test_normalize():
+    assert normalize('Abnormalities, Multiple') == 'abnormalities multiple'
+    assert normalize('  Seed   BANK ') == 'seed bank'
+
+
+def test_prefixing_query_matches(prefix_index):
+    suggestions = prefix_index.suggest('See')
+
+    assert suggestions == [
+        {
+            '_id': 'D000068098',
+            '_source': {'source': MESH_SOURCE, 'value': 'Seed Bank'}
+        }
+    ]
+
+
+def test_nonprefixing_query_doesnt_match(prefix_index):
+    assert prefix_index.suggest('Te') == []
+
+
+def test_split_inputs_match(prefix_index):
+    assert values(prefix_index.suggest('ba')) == ['Seed Bank']
+    assert values(prefix_index.suggest('mu')) == ['Abnormalities, Multiple']
+
+
+def test_document_is_suggested_once(prefix_index):
+    suggestions = prefix_index.suggest('seed bank')
+
+    assert values(suggestions) == ['Seed Bank']
+
+
+def test_limit(prefix_index):
+    assert 0 < len(prefix_index.suggest('ab', limit=3)) <= 3
+
+
+def test_source_constrained(prefix_index):
+    suggestions = prefix_index.suggest('Con', source=FAST_SOURCE)
+
+    assert values(suggestions) == ['Onions--Diseases and pests--Control']
+    assert prefix_index.suggest('Con', source='Unknown') == []
+
+
+@pytest.fixture(scope='module')
+def index_terms(es):
+    bulk(es, indexables())
+    es.indices.refresh(index=INDEX)
+
+
+@pytest.mark.usefixtures('index_terms')
+@pytest.mark.parametrize('query', ['See', 'Te', 'sEe', 'ba', 'mu', 'Con'])
+@pytest.mark.parametrize('source', [None, MESH_SOURCE, FAST_SOURCE])
+def test_parity_with_elasticsearch(es, tmpdir, query, source):
+    path = str(tmpdir.join('terms.prefix_index'))
+    build(path, es_terms(es))
+    index = PrefixIndex(path)
+
+    expected = _suggest_terms({'q': (query, source, 5)})['q']
+    suggestions = index.suggest(query, source, 5)
+
+    assert (
+        sorted(s['name'] for s in expected) ==
+        sorted(
+            '({source}) {value}'.format(**s['_source']) for s in suggestions
+        )
+    )
+    index.close()
@@ -0,0 +1,71 @@
+"""Test term id resolution."""
+
+from os.path import dirname, join, realpath
+
+import pytest
+from elasticsearch.helpers import bulk
+
+from cd2h_repo_project.modules.records.marshmallow.json import TermSchemaV1
+from cd2h_repo_project.modules.terms.fast import FAST
+from cd2h_repo_project.modules.terms.loaders import (
+    INDEX, fast_indexable, mesh_indexable
+)
+from cd2h_repo_project.modules.terms.mesh import MeSH
+from cd2h_repo_project.modules.terms.resolver import resolve_term_ids
+
+
+@pytest.fixture(scope='module')
+def index_terms(es):
+    filepath = join(dirname(realpath(__file__)), 'descriptors_test_file.txt')
+    indexable_terms = [
+        mesh_indexable(t) for t in MeSH.load(filepath, filter='topics')
+    ]
+    filepath = join(dirname(realpath(__file__)), 'fast_test_file.nt')
+    indexable_terms.extend(
+        fast_indexable(t) for t in FAST.load(filepath, engine='scan')
+    )
+
+    bulk(es, indexable_terms)
+    es.indices.refresh(index=INDEX)
+
+
+@pytest.mark.usefixtures('index_terms')
+class TestResolveTermIds(object):
+
+    def test_resolves_indexed_terms_in_one_search(self, es, mocker):
+        search = mocker.spy(es, 'search')
+        terms = [
+            {'source': 'MeSH', 'value': 'Seed Bank'},
+            {'source': 'FAST', 'value': 'Onions--Diseases and pests--Control'},
+            {'source': 'FAST', 'value': 'Seed Bank'},
+            {'source': 'MeSH', 'value': 'Unknown term'},
+        ]
+
+        ids = resolve_term_ids(terms, es=es)
+
+        assert ids == {
+            ('MeSH', 'Seed Bank'): 'D000068098',
+            ('FAST', 'Onions--Diseases and pests--Control'): '1045901',
+        }
+        assert search.call_count == 1
+
+    def test_no_terms(self, es):
+        assert resolve_term_ids([], es=es) == {}
+
+    def test_schema_attaches_ids_and_dedupes(self, appctx):
+        terms = [
+            {'source': 'MeSH', 'value': 'Seed Bank', 'id': 'FILL ME'},
+            {'source': 'MeSH', 'value': 'Seed Bank'},
+            {'source': 'MeSH', 'value': 'Unknown', 'id': 'FILL ME'},
+            {'source': 'MeSH', 'value': 'Other', 'id': 'D1'},
+            {'source': 'MeSH', 'value': 'Other'},
+        ]
+
+        loaded = TermSchemaV1(many=True).load([{'data': t} for t in terms])
+
+        assert not loaded.errors
+        assert loaded.data == [
+            {'source': 'MeSH', 'value': 'Seed Bank', 'id': 'D000068098'},
+            {'source': 'MeSH', 'value': 'Unknown'},
+            {'source': 'MeSH', 'value': 'Other', 'id': 'D1'},
+        ]
@@ -0,0 +1,84 @@
+"""Test snapshots of parsed vocabularies."""
+
+import shutil
+from os.path import dirname, exists, join, realpath
+
+import pytest
+
+from cd2h_repo_project.modules.terms import snapshot
+from cd2h_repo_project.modules.terms.mesh import MeSH
+
+
+def filepath(filename):
+    return join(dirname(realpath(__file__)), filename)
+
+
+@pytest.fixture
+def source(tmpdir):
+    path = str(tmpdir.join('descriptors.txt'))
+    shutil.copy(filepath('descriptors_test_file.txt'), path)
+    return path
+
+
+@pytest.fixture
+def directory(tmpdir):
+    return str(tmpdir.join('snapshots'))
+
+
+class CountingLoad(object):
+    def __init__(self, source):
+        self.source = source
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return MeSH.stream(self.source, filter='all')
+
+
+def test_cached_round_trips_terms(source, directory):
+    load = CountingLoad(source)
+
+    written = list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+    read = list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+
+    assert written == MeSH.load(source)
+    assert read == written
+    assert load.calls == 1
+
+
+def test_cached_reloads_changed_source(source, directory):
+    load = CountingLoad(source)
+    list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+
+    with open(source, 'a') as f:
+        f.write('\n*NEWRECORD\nMH = Foo\nDC = 1\nUI = D999999\n')
+    terms = list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+
+    assert load.calls == 2
+    assert terms[-1] == {'MH': 'Foo', 'DC': '1', 'UI': 'D999999'}
+
+
+def test_cached_is_keyed_by_params(source, directory):
+    load = CountingLoad(source)
+    list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+    list(snapshot.cached(source, ['MeSH', 'topics'], load, directory))
+
+    assert load.calls == 2
+    assert (
+        snapshot.snapshot_path(source, ['MeSH', 'all'], directory) !=
+        snapshot.snapshot_path(source, ['MeSH', 'topics'], directory)
+    )
+
+
+def test_interrupted_load_leaves_no_snapshot(source, directory):
+    load = CountingLoad(source)
+    terms = snapshot.cached(source, ['MeSH', 'all'], load, directory)
+    next(terms)
+    terms.close()
+
+    path = snapshot.snapshot_path(source, ['MeSH', 'all'], directory)
+    assert not exists(path)
+
+    list(snapshot.cached(source, ['MeSH', 'all'], load, directory))
+    assert load.calls == 2
+    assert exists(path)
@@ -1,17 +1,23 @@
 """Test MeSH extractor."""
 
+import json
 from os.path import dirname, join, realpath
 
 import pytest
 from elasticsearch.helpers import bulk
 
+from cd2h_repo_project.modules.terms import views
 from cd2h_repo_project.modules.terms.constants import FAST_SOURCE
 from cd2h_repo_project.modules.terms.fast import FAST
+from cd2h_repo_project.modules.terms.indexer import stamp_vocabulary_version
 from cd2h_repo_project.modules.terms.loaders import (
     INDEX, fast_indexable, mesh_indexable
 )
 from cd2h_repo_project.modules.terms.mesh import MeSH
-from cd2h_repo_project.modules.terms.suggester import suggest_terms
+from cd2h_repo_project.modules.terms.suggester import (
+    suggest_terms, suggest_terms_batch
+)
+from utils import login_request_and_session
 
 
 @pytest.fixture(scope='module')
@@ -45,7 +51,7 @@ class TestSuggester(object):
                 'value': {
                     'value': 'Seed Bank',
                     'source': 'MeSH',
-                    'id': 'FILL ME'  # TODO: Change id here
+                    'id': 'D000068098'
                 }
             },
         ]
@@ -68,7 +74,7 @@ class TestSuggester(object):
                 'value': {
                     'value': 'Seed Bank',
                     'source': 'MeSH',
-                    'id': 'FILL ME'  # TODO: Change id here
+                    'id': 'D000068098'
                 }
             },
         ]
@@ -84,7 +90,7 @@ class TestSuggester(object):
                 'value': {
                     'value': 'Seed Bank',
                     'source': 'MeSH',
-                    'id': 'FILL ME'  # TODO: Change id here
+                    'id': 'D000068098'
                 }
             },
         ]
@@ -100,11 +106,53 @@ class TestSuggester(object):
                 'value': {
                     'value': 'Abnormalities, Multiple',
                     'source': 'MeSH',
-                    'id': 'FILL ME'  # TODO: Change id here
+                    'id': 'D000015'
                 }
             },
         ]
 
+    def test_entry_term_suggests_heading(self):
+        query = "birth def"
+
+        terms = suggest_terms(query)
+
+        assert terms == [
+            {
+                'name': '(MeSH) Congenital Abnormalities',
+                'value': {
+                    'value': 'Congenital Abnormalities',
+                    'source': 'MeSH',
+                    'id': 'D000013'
+                }
+            },
+        ]
+
+    def test_inner_words_match(self):
+        terms = suggest_terms("topic abbrev")
+
+        assert [t['name'] for t in terms] == [
+            '(MeSH) Abbreviations as Topic'
+        ]
+
+        terms = suggest_terms("pests onio", source=FAST_SOURCE)
+
+        assert [t['name'] for t in terms] == [
+            '(FAST) Onions--Diseases and pests--Control'
+        ]
+
+    def test_partial_inner_words_match(self):
+        terms = suggest_terms("genital")
+
+        assert [t['name'] for t in terms] == [
+            '(MeSH) Congenital Abnormalities'
+        ]
+
+    def test_inner_words_complete_prefix_matches(self):
+        terms = suggest_terms("abdom", limit=2)
+
+        assert len(terms) == 2
+        assert len({t['value']['id'] for t in suggest_terms("abdom")}) == 3
+
     def test_limit(self):
         query = "ab"
 
@@ -128,7 +176,117 @@ class TestSuggester(object):
                 'value': {
                     'value': 'Onions--Diseases and pests--Control',
                     'source': source,
-                    'id': 'FILL ME'  # TODO: Change id here
+                    'id': '1045901'
                 }
             },
         ]
+
+    def test_batch_matches_single_queries(self):
+        queries = {
+            'mesh': ('See', 'MeSH', 5),
+            'fast': ('Con', FAST_SOURCE, 5),
+            'all': ('ab', None, 3),
+        }
+
+        terms = suggest_terms_batch(queries)
+
+        assert terms == {
+            name: suggest_terms(*query) for name, query in queries.items()
+        }
+
+    def test_batch_endpoint(self, client, create_user):
+        user = create_user()
+        login_request_and_session(user, client)
+
+        response = client.post(
+            '/terms/_suggest',
+            data=json.dumps({
+                'mesh': {'q': 'See', 'source': 'MeSH'},
+                'fast': {'q': 'Con', 'source': FAST_SOURCE, 'limit': 1},
+            }),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        terms = response.json['terms']
+        assert [t['name'] for t in terms['mesh']] == ['(MeSH) Seed Bank']
+        assert [t['name'] for t in terms['fast']] == [
+            '(FAST) Onions--Diseases and pests--Control'
+        ]
+
+    def test_batch_endpoint_rejects_invalid_queries(self, client, create_user):
+        user = create_user()
+        login_request_and_session(user, client)
+
+        response = client.post(
+            '/terms/_suggest',
+            data=json.dumps({'mesh': {'q': 'See', 'source': 'Unknown'}}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+
+    def test_batch_names_are_not_suggester_options(self):
+        # Limits not asked for elsewhere, so suggestions aren't cached yet
+        queries = {
+            'text': ('See', 'MeSH', 4),
+            'q0': ('Con', FAST_SOURCE, 4),
+        }
+
+        terms = suggest_terms_batch(queries)
+
+        assert terms == {
+            name: suggest_terms(*query) for name, query in queries.items()
+        }
+
+    def test_batch_endpoint_caps_limits(self, client, create_user, mocker):
+        user = create_user()
+        login_request_and_session(user, client)
+        spied_batch = mocker.spy(views, 'suggest_terms_batch')
+
+        response = client.post(
+            '/terms/_suggest',
+            data=json.dumps({'mesh': {'q': 'See', 'limit': 10 ** 6}}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        assert spied_batch.call_args[0][0] == {
+            'mesh': ('See', None, views.MAX_LIMIT)
+        }
+
+    def test_suggest_endpoint_is_cacheable(self, client, create_user):
+        user = create_user()
+        login_request_and_session(user, client)
+
+        response = client.get('/terms/mesh/_suggest?q=See')
+
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert response.cache_control.private
+        assert response.cache_control.max_age > 0
+
+        response = client.get(
+            '/terms/mesh/_suggest?q=see',
+            headers={'If-None-Match': response.headers['ETag']}
+        )
+
+        assert response.status_code == 304
+
+    def test_suggest_etag_changes_with_vocabulary(
+            self, app, es, client, create_user, monkeypatch):
+        monkeypatch.setitem(
+            app.config, 'TERMS_VOCABULARY_VERSION_INTERVAL', 0
+        )
+        user = create_user()
+        login_request_and_session(user, client)
+        response = client.get('/terms/_suggest?q=See')
+        etag = response.headers['ETag']
+
+        stamp_vocabulary_version(es)
+        response = client.get(
+            '/terms/_suggest?q=See', headers={'If-None-Match': etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
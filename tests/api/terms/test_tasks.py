@@ -0,0 +1,42 @@
+"""Test terms tasks."""
+
+from os.path import dirname, join, realpath
+
+from elasticsearch.helpers import bulk
+
+from cd2h_repo_project.modules.terms.loaders import INDEX, mesh_indexable
+from cd2h_repo_project.modules.terms.mesh import MeSH
+from cd2h_repo_project.modules.terms.suggester import _suggest_terms
+from cd2h_repo_project.modules.terms.tasks import update_term_usage
+
+
+def index_mesh_terms(es):
+    filepath = join(dirname(realpath(__file__)), 'descriptors_test_file.txt')
+    terms = MeSH.load(filepath, filter='topics')
+    bulk(es, [mesh_indexable(t) for t in terms])
+    es.indices.refresh(index=INDEX)
+
+
+def suggested_values(query):
+    terms = _suggest_terms({'q': (query, 'MeSH', 5)})['q']
+    return [t['value']['value'] for t in terms]
+
+
+def test_update_term_usage(es, create_record):
+    abdomen = {'source': 'MeSH', 'value': 'Abdomen'}
+    neoplasms = {'source': 'MeSH', 'value': 'Abdominal Neoplasms'}
+    create_record({'terms': [abdomen, neoplasms]})
+    create_record({'terms': [neoplasms]})
+    create_record({'terms': [abdomen, neoplasms]}, published=False)
+    index_mesh_terms(es)
+    assert suggested_values('abd')[0] == 'Abdomen'
+
+    updated = update_term_usage()
+
+    assert updated == 2
+    assert es.get(index=INDEX, id='D000008')['_source']['usage'] == 2
+    assert es.get(index=INDEX, id='D000005')['_source']['usage'] == 1
+    assert suggested_values('abd')[:2] == ['Abdominal Neoplasms', 'Abdomen']
+
+    # Unchanged usage is not updated again
+    assert update_term_usage() == 0
@@ -0,0 +1,89 @@
+"""Test general utilities."""
+
+import threading
+import time
+
+import pytest
+
+from cd2h_repo_project.utils import SingleFlight
+
+
+class SlowCall(object):
+    """Call blocking until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {'hits': [self.calls]}
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    flight = SingleFlight()
+    call = SlowCall()
+
+    leader = threading.Thread(target=flight.do, args=('k', call))
+    leader.start()
+    call.started.wait(5)
+
+    results = []
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(flight.do('k', call))
+        )
+        for _ in range(5)
+    ]
+    for follower in followers:
+        follower.start()
+    deadline = time.monotonic() + 5
+    while flight.stats()['coalesced'] < 5:
+        if time.monotonic() > deadline:
+            call.release.set()
+            pytest.fail('Followers were not coalesced.')
+        time.sleep(0.01)
+    call.release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert call.calls == 1
+    assert results == [{'hits': [1]}] * 5
+    # Each caller has its own copy
+    assert len({id(result) for result in results}) == 5
+
+
+def test_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    def call():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do('k', call) == 1
+    assert flight.do('k', call) == 2
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+
+    assert flight.do('a', lambda: 'a') == 'a'
+    assert flight.do('b', lambda: 'b') == 'b'
+    assert flight.stats()['coalesced'] == 0
+
+
+def test_error_percolates():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        flight.do('k', fail)
+
+    assert flight.do('k', lambda: 'ok') == 'ok'